@@ -0,0 +1,169 @@
+'''
+Libro delle aperture del Trissone.
+
+Lo strumento offline esplora tutte le posizioni fino a una profondità data, tiene una sola
+posizione per classe di simmetria e la valuta con partite casuali. Il risultato è salvato
+in una tabella hash su disco (indirizzamento aperto), che il lettore mappa in memoria
+per consultarla in O(1) durante il gioco.
+
+    intestazione: b"TRAP", versione (1 byte), profondità (1 byte), capienza (4 byte), voci (4 byte)
+    capienza slot da 24 byte: chiave (8 byte, 0 = slot vuoto), visite, vinte dal cerchio,
+                              vinte dall'ics, pareggi (4 byte ciascuno)
+
+La chiave è l'hash di Zobrist (stesse chiavi di Trissone.hash) della forma canonica.
+'''
+import mmap
+import struct
+import argparse
+import random as rnd
+from Gioco import VocGiocatori, ZobristCelle, ZobristNext
+from Bitboard import TrissoneBit
+from Simmetrie import canonico_trissone
+
+
+MAGIC = b"TRAP"
+VERSIONE = 1
+INTESTAZIONE = struct.Struct("<4sBBII")
+VOCE = struct.Struct("<QIIII")
+
+
+def chiave(partita):
+    """Hash di Zobrist della forma canonica di un TrissoneBit (uguale per posizioni simmetriche)."""
+    celle, next, _ = canonico_trissone(partita.celle(), partita.next)
+    h = ZobristNext[9 if next is None else next]
+    for k, v in enumerate(celle):
+        if v:
+            h ^= ZobristCelle[k // 9][k % 9][v]
+    return h
+
+
+def posizioni(profondita):
+    """Genera (chiave, posizione) per un rappresentante di ogni classe di simmetria fino a 'profondita' mosse."""
+    livello = [TrissoneBit()]
+    viste = {chiave(livello[0])}
+    yield chiave(livello[0]), livello[0]
+    for _ in range(profondita):
+        successivo = []
+        for partita in livello:
+            for posGrande, posizione in partita.legal_moves():
+                figlio = partita.copia()
+                figlio.add(figlio.mosse % 2 == 0, posizione, posGrande)
+                k = chiave(figlio)
+                if k not in viste:
+                    viste.add(k)
+                    successivo.append(figlio)
+                    yield k, figlio
+        livello = [p for p in successivo if not p.fine]
+
+
+def valuta(partita, playout, rng):
+    """Statistiche [visite, vinte dal cerchio, vinte dall'ics, pareggi] da 'playout' partite casuali."""
+    statistiche = [playout, 0, 0, 0]
+    for _ in range(playout):
+        stato = partita.copia()
+        while not stato.fine:
+            posGrande, posizione = stato.random_legal_move(rng)
+            stato.add(stato.mosse % 2 == 0, posizione, posGrande)
+        if stato.vincitore == VocGiocatori[1]:
+            statistiche[1] += 1
+        elif stato.vincitore == VocGiocatori[2]:
+            statistiche[2] += 1
+        else:
+            statistiche[3] += 1
+    return statistiche
+
+
+def costruisci(percorso, profondita=3, playout=200, seed=0):
+    """Valuta tutte le posizioni fino a 'profondita' e salva il libro in 'percorso'. Restituisce il numero di voci."""
+    rng = rnd.Random(seed)
+    voci = [(k, valuta(partita, playout, rng)) for k, partita in posizioni(profondita)]
+
+    # Capienza potenza di 2, almeno il doppio delle voci, per sonde brevi
+    capienza = 1
+    while capienza < 2 * len(voci):
+        capienza *= 2
+    tabella = bytearray(INTESTAZIONE.size + capienza * VOCE.size)
+    INTESTAZIONE.pack_into(tabella, 0, MAGIC, VERSIONE, profondita, capienza, len(voci))
+    occupati = [False] * capienza
+    for k, statistiche in voci:
+        slot = k & (capienza - 1)
+        while occupati[slot]:
+            slot = (slot + 1) & (capienza - 1)
+        occupati[slot] = True
+        VOCE.pack_into(tabella, INTESTAZIONE.size + slot * VOCE.size, k, *statistiche)
+    with open(percorso, "wb") as f:
+        f.write(tabella)
+    return len(voci)
+
+
+class LibroAperture:
+    '''Lettore del libro: il file è mappato in memoria e ogni ricerca legge pochi slot.'''
+    def __init__(self, percorso):
+        self.f = open(percorso, "rb")
+        self.dati = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, versione, self.profondita, self.capienza, self.voci = INTESTAZIONE.unpack_from(self.dati)
+        if magic != MAGIC or versione != VERSIONE:
+            raise ValueError(f"{percorso}: non è un libro delle aperture valido")
+
+    def __len__(self):
+        return self.voci
+
+    def statistiche(self, k):
+        """Statistiche (visite, vinte dal cerchio, vinte dall'ics, pareggi) della chiave 'k', None se assente."""
+        maschera = self.capienza - 1
+        slot = k & maschera
+        while True:
+            voce = VOCE.unpack_from(self.dati, INTESTAZIONE.size + slot * VOCE.size)
+            if voce[0] == k:
+                return voce[1:]
+            if voce[0] == 0:
+                return None
+            slot = (slot + 1) & maschera
+
+    def cerca(self, partita):
+        """Statistiche della posizione di un TrissoneBit (o di una sua simmetrica), None se fuori dal libro."""
+        if partita.mosse > self.profondita:
+            return None
+        return self.statistiche(chiave(partita))
+
+    def mossa_migliore(self, partita):
+        """
+        Mossa (posGrande, posizione) con la percentuale di vittorie più alta per il giocatore
+        di turno (i pareggi valgono mezzo punto), None se le posizioni successive non sono nel libro.
+        """
+        cerchio = partita.mosse % 2 == 0
+        migliore, punteggio_migliore = None, -1.0
+        for posGrande, posizione in partita.legal_moves():
+            figlio = partita.copia()
+            figlio.add(cerchio, posizione, posGrande)
+            statistiche = self.cerca(figlio)
+            if statistiche is None or statistiche[0] == 0:
+                continue
+            visite, vinte_o, vinte_x, pareggi = statistiche
+            punteggio = ((vinte_o if cerchio else vinte_x) + 0.5 * pareggi) / visite
+            if punteggio > punteggio_migliore:
+                migliore, punteggio_migliore = (posGrande, posizione), punteggio
+        return migliore
+
+    def close(self):
+        self.dati.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Costruzione del libro delle aperture del Trissone')
+    parser.add_argument('-profondita', type=int, default=3, help='Numero di mosse iniziali da esplorare')
+    parser.add_argument('-playout', type=int, default=200, help='Partite casuali per posizione')
+    parser.add_argument('-seed', type=int, default=0, help='Seme del generatore casuale')
+    parser.add_argument('-o', default='aperture.bin', help='File del libro')
+    args = parser.parse_args()
+
+    voci = costruisci(args.o, args.profondita, args.playout, args.seed)
+    print(f"{voci} posizioni salvate in {args.o}")
@@ -0,0 +1,164 @@
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+import random as rnd
+import numpy as np
+from Gioco import Tris, Trissone
+from Bitboard import TrisBit, TrissoneBit
+
+
+# Motori misurati: nome -> (classe, True se è un Trissone)
+MOTORI = {
+    "Tris": (Tris, False),
+    "TrisBit": (TrisBit, False),
+    "Trissone": (Trissone, True),
+    "TrissoneBit": (TrissoneBit, True),
+}
+
+
+def _gioca(partita, grande, mossa, cerchio):
+    if grande:
+        partita.add(cerchio, mossa[1], mossa[0])
+    else:
+        partita.add(cerchio, mossa)
+
+
+def sequenze(classe, grande, n, seed):
+    """Sequenze di mosse di 'n' partite casuali, sempre le stesse a parità di seme."""
+    rng = rnd.Random(seed)
+    risultato = []
+    for _ in range(n):
+        partita = classe()
+        mosse = []
+        while not partita.fine:
+            mossa = partita.random_legal_move(rng)
+            _gioca(partita, grande, mossa, len(mosse) % 2 == 0)
+            mosse.append(mossa)
+        risultato.append(mosse)
+    return risultato
+
+
+def misura_add(classe, grande, partite):
+    """Mosse al secondo di add, rigiocando sequenze già note (nessuna estrazione casuale)."""
+    mosse = 0
+    inizio = time.perf_counter()
+    for sequenza in partite:
+        partita = classe()
+        for i, mossa in enumerate(sequenza):
+            _gioca(partita, grande, mossa, i % 2 == 0)
+        mosse += len(sequenza)
+    return mosse / (time.perf_counter() - inizio)
+
+
+def misura_playout(classe, grande, n, seed):
+    """Partite casuali complete al secondo (estrazione con random_legal_move)."""
+    rng = rnd.Random(seed)
+    inizio = time.perf_counter()
+    for _ in range(n):
+        partita = classe()
+        cerchio = True
+        while not partita.fine:
+            _gioca(partita, grande, partita.random_legal_move(rng), cerchio)
+            cerchio = not cerchio
+    return n / (time.perf_counter() - inizio)
+
+
+def misura_legal_moves(classe, grande, partite):
+    """Chiamate al secondo di legal_moves, ciascuna su una posizione nuova."""
+    chiamate = 0
+    tempo = 0.0
+    for sequenza in partite:
+        partita = classe()
+        for i, mossa in enumerate(sequenza):
+            inizio = time.perf_counter()
+            partita.legal_moves()
+            tempo += time.perf_counter() - inizio
+            chiamate += 1
+            _gioca(partita, grande, mossa, i % 2 == 0)
+    return chiamate / tempo
+
+
+def misura_memoria(classe, grande, partite):
+    """Byte per stato di gioco, per partite appena create e per partite concluse."""
+    tracemalloc.start()
+    nuove = [classe() for _ in partite]
+    byte_nuova = tracemalloc.get_traced_memory()[0] / len(nuove)
+    del nuove
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    finite = []
+    for sequenza in partite:
+        partita = classe()
+        for i, mossa in enumerate(sequenza):
+            _gioca(partita, grande, mossa, i % 2 == 0)
+        finite.append(partita)
+    byte_finita = tracemalloc.get_traced_memory()[0] / len(finite)
+    del finite
+    tracemalloc.stop()
+    return byte_nuova, byte_finita
+
+
+def misura_vettoriale(n, k, seed):
+    """Partite al secondo del motore vettoriale NumPy."""
+    from Vettoriale import simula
+    inizio = time.perf_counter()
+    simula(n, k, seed)
+    return n / (time.perf_counter() - inizio)
+
+
+def benchmark(partite=200, seed=0, ripetizioni=3, motori=None):
+    """
+    Esegue tutte le misure e restituisce un dizionario serializzabile in JSON.
+    Per le velocità si tiene il migliore di 'ripetizioni' tentativi.
+    """
+    risultati = {}
+    for nome in motori or MOTORI:
+        classe, grande = MOTORI[nome]
+        # Le partite dei Tris sono molto più brevi: se ne giocano di più
+        n = partite if grande else partite * 10
+        seq = sequenze(classe, grande, n, seed)
+        byte_nuova, byte_finita = misura_memoria(classe, grande, seq)
+        risultati[nome] = {
+            "add_mosse_al_secondo": max(misura_add(classe, grande, seq) for _ in range(ripetizioni)),
+            "playout_partite_al_secondo": max(misura_playout(classe, grande, n, seed) for _ in range(ripetizioni)),
+            "legal_moves_al_secondo": max(misura_legal_moves(classe, grande, seq) for _ in range(ripetizioni)),
+            "byte_per_stato_nuovo": byte_nuova,
+            "byte_per_stato_finito": byte_finita,
+            "mosse_per_partita": sum(map(len, seq)) / n,
+        }
+    if motori is None or "Vettoriale" in motori:
+        risultati["Vettoriale"] = {
+            "playout_partite_al_secondo": max(misura_vettoriale(partite * 10, 1024, seed) for _ in range(ripetizioni)),
+        }
+    return {
+        "seed": seed,
+        "partite": partite,
+        "ripetizioni": ripetizioni,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "macchina": platform.machine(),
+        "risultati": risultati,
+    }
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Benchmark dei motori di gioco (Tris, Trissone e varianti)')
+    parser.add_argument('-partite', type=int, default=200, help='Numero di partite di Trissone per misura')
+    parser.add_argument('-seed', type=int, default=0, help='Seme del generatore casuale')
+    parser.add_argument('-ripetizioni', type=int, default=3, help='Ripetizioni di ogni misura (si tiene la migliore)')
+    parser.add_argument('-motori', nargs='+', choices=list(MOTORI) + ["Vettoriale"], default=None, help='Motori da misurare (default: tutti)')
+    parser.add_argument('-o', default=None, help='File JSON di output (default: standard output)')
+    args = parser.parse_args()
+
+    dati = benchmark(args.partite, args.seed, args.ripetizioni, args.motori)
+    if args.o:
+        with open(args.o, "w") as f:
+            json.dump(dati, f, indent=2)
+    else:
+        json.dump(dati, sys.stdout, indent=2)
+        print()
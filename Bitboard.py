@@ -0,0 +1,286 @@
+from Gioco import PosizioniVincenti, VocGiocatori
+from Tabelle import Ternario, VincibileTris, LineaVincente
+
+
+# Maschera di un mini board pieno
+PIENO = 0x1FF
+
+# Per ogni maschera di celle occupate: lista delle celle ancora libere
+CelleLibere = [[i for i in range(9) if not _maschera >> i & 1] for _maschera in range(512)]
+
+
+class TrisBit:
+    '''
+    Tris (mini board) rappresentato con due maschere a 9 bit, una per giocatore.
+    Ha la stessa interfaccia di Tris (add, Check, fine, vincitore, tris, pos)
+    ma lavora solo con interi Python, senza array NumPy.
+    '''
+    __slots__ = ("o", "x", "fine", "vincitore", "tris")
+
+    def __init__(self):
+        self.o = 0  # Celle occupate dal cerchio
+        self.x = 0  # Celle occupate dall'ics
+        self.fine = False
+        self.vincitore = 0
+        self.tris = None
+
+    @classmethod
+    def da_maschere(cls, o, x):
+        """Costruisce un mini board a partire dalle maschere dei due giocatori."""
+        tris = cls()
+        tris.o = o
+        tris.x = x
+        tris.Check()
+        return tris
+
+    @property
+    def pos(self):
+        """Vista della posizione come lista di 9 elementi (0: vuota, 1: O, 2: X)."""
+        return [1 if self.o >> i & 1 else 2 if self.x >> i & 1 else 0 for i in range(9)]
+
+    @property
+    def mosse(self):
+        """Numero di mosse giocate, come Tris.mosse."""
+        return bin(self.o | self.x).count("1")
+
+    @property
+    def codice(self):
+        """Codice in base 3 della posizione, come Tris.codice (indice delle tabelle in Tabelle)."""
+        return Ternario[self.o] + 2 * Ternario[self.x]
+
+    @property
+    def morto(self):
+        """Vero se il mini board è ancora aperto ma nessuno dei due giocatori può più completare una linea."""
+        return not self.fine and not VincibileTris[self.codice]
+
+    def Check(self):
+        if not self.fine:
+            for maschera, giocatore in ((self.o, 1), (self.x, 2)):
+                linea = LineaVincente[maschera]
+                if linea >= 0:
+                    self.fine = True
+                    self.vincitore = VocGiocatori[giocatore]
+                    self.tris = PosizioniVincenti[linea]
+                    return
+            if self.o | self.x == PIENO:
+                self.fine = True
+                self.vincitore = VocGiocatori[3]
+
+    def add(self, cerchio: bool, posizione: int):
+        if posizione < 0 or posizione > 8:
+            raise IndexError("Posizione non valida")
+        if self.fine:
+            raise IndexError("Tris già finito")
+        bit = 1 << posizione
+        if (self.o | self.x) & bit:
+            raise IndexError("Posizione non valida")
+        # Solo chi ha appena mosso può aver completato una linea
+        if cerchio:
+            self.o |= bit
+            linea = LineaVincente[self.o]
+        else:
+            self.x |= bit
+            linea = LineaVincente[self.x]
+        if linea >= 0:
+            self.fine = True
+            self.vincitore = VocGiocatori[1 if cerchio else 2]
+            self.tris = PosizioniVincenti[linea]
+        elif self.o | self.x == PIENO:
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+
+    def legal_moves(self):
+        """Restituisce la lista (da non modificare) delle celle giocabili."""
+        return [] if self.fine else CelleLibere[self.o | self.x]
+
+    def random_legal_move(self, rng):
+        """Estrae una cella giocabile a caso usando 'rng' (random.Random o il modulo random)."""
+        return rng.choice(self.legal_moves())
+
+
+class TrissoneBit:
+    '''
+    Trissone (Ultimate Tic Tac Toe) rappresentato con maschere di bit:
+    per ogni mini board una maschera a 9 bit per giocatore, più tre maschere
+    a 9 bit a livello "grande" (mini board vinti dal cerchio, dall'ics e conclusi).
+    Ha la stessa interfaccia di Trissone (add, Check, fine, vincitore, next, tris),
+    compresa la modalità 'patte' (vedi Trissone).
+    '''
+    __slots__ = ("o", "x", "vinti_o", "vinti_x", "chiusi", "fine", "vincitore", "next", "tris", "mosse",
+                 "patte", "vivi_o", "vivi_x")
+
+    def __init__(self, patte=False):
+        self.o = [0] * 9
+        self.x = [0] * 9
+        self.vinti_o = 0  # Mini board vinti dal cerchio
+        self.vinti_x = 0  # Mini board vinti dall'ics
+        self.chiusi = 0   # Mini board conclusi (vinti o pareggiati)
+        self.fine = False
+        self.vincitore = 0
+        self.next = None  # Indice del mini board in cui dovrà essere giocata la prossima mossa
+        self.tris = None  # Combinazione vincente a livello di Trissone
+        self.mosse = 0    # Numero di mosse giocate (il cerchio muove quando è pari)
+        self.patte = patte
+        # Solo in modalità patte: mini board che il cerchio / l'ics possono ancora far propri
+        self.vivi_o = PIENO
+        self.vivi_x = PIENO
+
+    def copia(self):
+        """Restituisce una copia indipendente della posizione (molto più economica di deepcopy)."""
+        nuova = TrissoneBit.__new__(TrissoneBit)
+        nuova.o = self.o[:]
+        nuova.x = self.x[:]
+        nuova.vinti_o = self.vinti_o
+        nuova.vinti_x = self.vinti_x
+        nuova.chiusi = self.chiusi
+        nuova.fine = self.fine
+        nuova.vincitore = self.vincitore
+        nuova.next = self.next
+        nuova.tris = self.tris
+        nuova.mosse = self.mosse
+        nuova.patte = self.patte
+        nuova.vivi_o = self.vivi_o
+        nuova.vivi_x = self.vivi_x
+        return nuova
+
+    @classmethod
+    def da_celle(cls, celle, next=None, patte=False):
+        """Costruisce un TrissoneBit dalle 81 celle (come restituite da celle()) e dal vincolo next."""
+        partita = cls(patte)
+        for k, v in enumerate(celle):
+            if v == 1:
+                partita.o[k // 9] |= 1 << (k % 9)
+            elif v == 2:
+                partita.x[k // 9] |= 1 << (k % 9)
+            if v:
+                partita.mosse += 1
+        partita.next = next
+        partita.Check()
+        return partita
+
+    def celle(self):
+        """Posizione come tupla di 81 valori (indice posGrande * 9 + posizione; 0 vuota, 1 O, 2 X)."""
+        return tuple(1 if self.o[b] >> c & 1 else 2 if self.x[b] >> c & 1 else 0 for b in range(9) for c in range(9))
+
+    @property
+    def pos(self):
+        """Vista dei 9 mini board come oggetti TrisBit (per i renderer)."""
+        return [TrisBit.da_maschere(self.o[i], self.x[i]) for i in range(9)]
+
+    def Check(self):
+        # Ricalcola da zero lo stato dei mini board e del Trissone a partire dalle maschere
+        self.vinti_o = self.vinti_x = self.chiusi = 0
+        for i in range(9):
+            if LineaVincente[self.o[i]] >= 0:
+                self.vinti_o |= 1 << i
+            elif LineaVincente[self.x[i]] >= 0:
+                self.vinti_x |= 1 << i
+            elif self.o[i] | self.x[i] != PIENO:
+                continue
+            self.chiusi |= 1 << i
+        for vinti, giocatore in ((self.vinti_o, 1), (self.vinti_x, 2)):
+            linea = LineaVincente[vinti]
+            if linea >= 0:
+                self.fine = True
+                self.vincitore = VocGiocatori[giocatore]
+                self.tris = PosizioniVincenti[linea]
+                return
+        if self.chiusi == PIENO:
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+        elif self.patte:
+            self.vivi_o = self.vivi_x = PIENO
+            for i in range(9):
+                self._Vivi(i)
+
+    def _Vivi(self, indice):
+        """
+        Modalità patte: aggiorna vivi_o / vivi_x per il mini board 'indice' e chiude la partita
+        in pareggio se nessuna linea grande è più completabile da uno dei due giocatori.
+        """
+        bit = 1 << indice
+        if self.vinti_o & bit:
+            vincibile = 1
+        elif self.vinti_x & bit:
+            vincibile = 2
+        else:
+            vincibile = VincibileTris[Ternario[self.o[indice]] + 2 * Ternario[self.x[indice]]]
+        self.vivi_o = self.vivi_o | bit if vincibile & 1 else self.vivi_o & ~bit
+        self.vivi_x = self.vivi_x | bit if vincibile & 2 else self.vivi_x & ~bit
+        if LineaVincente[self.vivi_o] < 0 and LineaVincente[self.vivi_x] < 0:
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+
+    def add(self, cerchio: bool, posizione: int, posGrande: int):
+        """
+        Aggiunge una mossa nel Trissone, con le stesse regole di Trissone.add.
+          - cerchio: True se gioca il cerchio, False se gioca "ics"
+          - posizione: posizione (0-8) all'interno del mini board
+          - posGrande: indice del mini board scelto (usato solo se self.next è None)
+        """
+        if posizione < 0 or posizione > 8 or posGrande < 0 or posGrande > 8:
+            raise IndexError("Posizione non valida, out of bound")
+        if self.fine:
+            raise IndexError("Trissone già finito")
+        if self.next is not None and posGrande != self.next:
+            raise IndexError("Non è qui che devi giocare!!!")
+        bit_grande = 1 << posGrande
+        if self.chiusi & bit_grande:
+            raise IndexError("Tris piccolo già finito")
+        bit = 1 << posizione
+        o = self.o[posGrande]
+        x = self.x[posGrande]
+        if (o | x) & bit:
+            raise IndexError("Posizione non valida")
+
+        # Aggiorna solo il mini board giocato
+        if cerchio:
+            o |= bit
+            self.o[posGrande] = o
+            vinto = LineaVincente[o] >= 0
+        else:
+            x |= bit
+            self.x[posGrande] = x
+            vinto = LineaVincente[x] >= 0
+        self.mosse += 1
+
+        if vinto:
+            self.chiusi |= bit_grande
+            if cerchio:
+                self.vinti_o |= bit_grande
+                linea = LineaVincente[self.vinti_o]
+            else:
+                self.vinti_x |= bit_grande
+                linea = LineaVincente[self.vinti_x]
+            if linea >= 0:
+                self.fine = True
+                self.vincitore = VocGiocatori[1 if cerchio else 2]
+                self.tris = PosizioniVincenti[linea]
+        elif o | x == PIENO:
+            self.chiusi |= bit_grande
+
+        if not self.fine:
+            if self.chiusi == PIENO:
+                self.fine = True
+                self.vincitore = VocGiocatori[3]
+            elif self.patte:
+                self._Vivi(posGrande)
+
+        # La prossima mossa va giocata nel mini board corrispondente alla cella appena giocata
+        self.next = None if self.chiusi & bit else posizione
+
+    def legal_moves(self):
+        """Restituisce la lista delle mosse legali come coppie (posGrande, posizione)."""
+        if self.fine:
+            return []
+        if self.next is not None:
+            return [(self.next, cella) for cella in CelleLibere[self.o[self.next] | self.x[self.next]]]
+        return [(i, cella) for i in range(9) if not self.chiusi >> i & 1
+                for cella in CelleLibere[self.o[i] | self.x[i]]]
+
+    def random_legal_move(self, rng):
+        """Estrae una mossa legale (posGrande, posizione) a caso usando 'rng'."""
+        if self.next is not None and not self.fine:
+            # Caso più frequente: basta estrarre una cella libera del mini board obbligato
+            return self.next, rng.choice(CelleLibere[self.o[self.next] | self.x[self.next]])
+        return rng.choice(self.legal_moves())
@@ -0,0 +1,268 @@
+'''
+Giocatori (umani esclusi) per il simulatore e per le interfacce.
+
+Ogni giocatore implementa choose_move(stato, tempo=None, interrompi=None), che restituisce
+la mossa da giocare nello stesso formato di stato.legal_moves(): la cella per Tris / TrisBit,
+la coppia (posGrande, posizione) per Trissone / TrissoneBit. 'tempo' è il budget in secondi
+e 'interrompi' un threading.Event che chiede di fermare la ricerca (entrambi ignorati dai
+giocatori istantanei). choose_move non modifica lo stato.
+
+Pensatore esegue un giocatore in un thread separato con una scadenza, così che il loop
+di un'interfaccia resti reattivo mentre l'AI pensa.
+'''
+import copy
+import time
+import inspect
+import threading
+import random as rnd
+from Tabelle import Potenze3, Ternario, EsitoTris, MinacceCerchio, MinacceIcs, LineaVincente
+from Bitboard import TrissoneBit
+
+
+def di_turno(stato):
+    """True se tocca al cerchio (inizia sempre il cerchio)."""
+    return stato.mosse % 2 == 0
+
+
+def gioca(stato, mossa):
+    """Gioca 'mossa' (nel formato di legal_moves) per il giocatore di turno."""
+    if isinstance(mossa, tuple):
+        stato.add(di_turno(stato), mossa[1], mossa[0])
+    else:
+        stato.add(di_turno(stato), mossa)
+
+
+def grande(stato):
+    """True se 'stato' è un Trissone (o TrissoneBit), False se è un tris."""
+    return hasattr(stato, "next")
+
+
+def situazione(stato):
+    """
+    Codici dei 9 mini board (indici delle tabelle di Tabelle) e maschere a 9 bit dei mini board
+    conclusi, vinti dal cerchio e vinti dall'ics, per Trissone e TrissoneBit.
+    """
+    if isinstance(stato, TrissoneBit):
+        codici = [Ternario[o] + 2 * Ternario[x] for o, x in zip(stato.o, stato.x)]
+        return codici, stato.chiusi, stato.vinti_o, stato.vinti_x
+    codici = [board.codice for board in stato.pos]
+    chiusi = vinti_o = vinti_x = 0
+    for i, board in enumerate(stato.pos):
+        if board.fine:
+            chiusi |= 1 << i
+            esito = EsitoTris[board.codice]
+            if esito == 1:
+                vinti_o |= 1 << i
+            elif esito == 2:
+                vinti_x |= 1 << i
+    return codici, chiusi, vinti_o, vinti_x
+
+
+class GiocatoreCasuale:
+    '''Sceglie una mossa legale a caso.'''
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else rnd.Random()
+
+    def choose_move(self, stato, tempo=None, interrompi=None):
+        return stato.random_legal_move(self.rng)
+
+
+class GiocatoreGoloso:
+    '''
+    Euristica a un passo basata sulle tabelle dei mini board: vince se può (il mini board
+    o la partita), altrimenti blocca le minacce dell'avversario ed evita di mandarlo in un
+    mini board dove può vincere subito o di lasciargli la scelta libera. A parità di punteggio
+    sceglie a caso.
+    '''
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else rnd.Random()
+
+    def punteggio(self, stato, mossa, cerchio):
+        """Punteggio euristico di 'mossa' per il giocatore 'cerchio' (più alto è meglio)."""
+        mie, sue = (MinacceCerchio, MinacceIcs) if cerchio else (MinacceIcs, MinacceCerchio)
+        if not grande(stato):
+            codice = stato.codice
+            if mie[codice] >> mossa & 1:
+                return 1000
+            return (6 if sue[codice] >> mossa & 1 else 0) + (1 if mossa == 4 else 0)
+
+        codici, chiusi, vinti_o, vinti_x = situazione(stato)
+        vinti_miei, vinti_suoi = (vinti_o, vinti_x) if cerchio else (vinti_x, vinti_o)
+        posGrande, posizione = mossa
+        punti = 0
+        codice = codici[posGrande]
+        if mie[codice] >> posizione & 1:
+            if LineaVincente[vinti_miei | 1 << posGrande] >= 0:
+                return 1000
+            punti += 10
+        elif sue[codice] >> posizione & 1:
+            punti += 6
+        dopo = codice + (1 if cerchio else 2) * Potenze3[posizione]
+        if EsitoTris[dopo]:
+            chiusi |= 1 << posGrande
+        # Mini board in cui dovrà giocare l'avversario
+        if chiusi >> posizione & 1:
+            punti -= 3
+        else:
+            destinazione = dopo if posizione == posGrande else codici[posizione]
+            if sue[destinazione]:
+                punti -= 500 if LineaVincente[vinti_suoi | 1 << posizione] >= 0 else 8
+        return punti
+
+    def choose_move(self, stato, tempo=None, interrompi=None):
+        cerchio = di_turno(stato)
+        mosse = stato.legal_moves()
+        punti = [self.punteggio(stato, mossa, cerchio) for mossa in mosse]
+        migliore = max(punti)
+        return self.rng.choice([m for m, p in zip(mosse, punti) if p == migliore])
+
+
+class GiocatoreRicerca:
+    '''
+    Giocatore basato sulla ricerca: gioco perfetto (Risolutore) nel tris,
+    Monte Carlo Tree Search (MCTS) nel Trissone, entro il budget di tempo.
+    '''
+    def __init__(self, tempo=1.0, rng=None, iterazioni=None):
+        from MCTS import MCTS
+        self.tempo = tempo
+        self.mcts = MCTS(tempo, iterazioni, rng=rng if rng is not None else rnd.Random())
+
+    def choose_move(self, stato, tempo=None, interrompi=None):
+        if not grande(stato):
+            from Risolutore import mossa_migliore
+            return mossa_migliore(stato)
+        if not isinstance(stato, TrissoneBit):
+            stato = TrissoneBit.da_celle(stato.celle(), stato.next)
+        # Riusa il sottoalbero della risposta dell'avversario, poi quello della mossa scelta
+        self.mcts.sincronizza(stato)
+        mossa = self.mcts.cerca(stato, self.tempo if tempo is None else tempo, interrompi)
+        self.mcts.avanza(mossa)
+        return mossa
+
+
+class GiocatoreValutazione:
+    '''
+    Sceglie la mossa che porta alla posizione con la migliore valutazione euristica
+    (Valutazione.valuta) per il giocatore di turno; a parità sceglie a caso.
+    '''
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else rnd.Random()
+
+    def choose_move(self, stato, tempo=None, interrompi=None):
+        from Valutazione import valuta
+        if grande(stato) and not isinstance(stato, TrissoneBit):
+            stato = TrissoneBit.da_celle(stato.celle(), stato.next)
+        segno = 1 if di_turno(stato) else -1
+        mosse = stato.legal_moves()
+        valori = []
+        for mossa in mosse:
+            dopo = stato.copia() if hasattr(stato, "copia") else copy.deepcopy(stato)
+            gioca(dopo, mossa)
+            valori.append(segno * valuta(dopo))
+        migliore = max(valori)
+        return self.rng.choice([m for m, v in zip(mosse, valori) if v == migliore])
+
+
+# Giocatori disponibili da riga di comando
+GIOCATORI = {
+    "casuale": GiocatoreCasuale,
+    "goloso": GiocatoreGoloso,
+    "valutazione": GiocatoreValutazione,
+    "ricerca": GiocatoreRicerca,
+}
+
+
+def crea_giocatore(nome, rng=None, tempo=None):
+    """Crea il giocatore 'nome' (chiave di GIOCATORI) con il generatore 'rng'."""
+    if nome == "ricerca":
+        return GiocatoreRicerca(1.0 if tempo is None else tempo, rng)
+    return GIOCATORI[nome](rng)
+
+
+class Pensatore:
+    '''
+    Esegue choose_move di un giocatore su una copia dello stato, in un thread nuovo per ogni
+    ricerca. L'interfaccia chiama avvia() e poi, a ogni frame, mossa(): None finché il giocatore
+    sta pensando. La scadenza (tempo + tolleranza) parte quando il thread inizia a pensare;
+    se passa senza risposta si gioca una mossa casuale. annulla() chiede alla ricerca in corso
+    di fermarsi (evento 'interrompi') e ne scarta il risultato.
+    Nessun metodo blocca l'interfaccia: se una ricerca annullata è ancora in corso (un giocatore
+    che ignora 'interrompi' pensa fino alla fine del suo budget), la nuova resta in attesa e
+    mossa() la avvia appena il thread precedente termina; anche l'attesa conta nella scadenza.
+    '''
+    def __init__(self, giocatore, tempo=1.0, tolleranza=0.5):
+        self.giocatore = giocatore
+        self.tempo = tempo
+        self.tolleranza = tolleranza
+        # I giocatori scritti prima di 'interrompi' (choose_move(stato, tempo)) restano utilizzabili
+        self.interrompibile = "interrompi" in inspect.signature(giocatore.choose_move).parameters
+        self.thread = None
+        self.interrompi = None
+        self.stato = None
+        self.in_attesa = None  # Copia dello stato per la ricerca non ancora avviata
+        self.richiesta = 0.0   # Istante di avvia()
+        self.inizio = None     # Istante in cui il thread ha iniziato a pensare
+        self.risultato = None  # (mossa, eccezione) alla fine della ricerca
+
+    @property
+    def attivo(self):
+        return self.interrompi is not None
+
+    def avvia(self, stato):
+        """Inizia a pensare alla mossa per 'stato' (che l'interfaccia non deve modificare nel frattempo)."""
+        self.annulla()
+        self.stato = stato
+        self.in_attesa = stato.copia() if hasattr(stato, "copia") else copy.deepcopy(stato)
+        self.interrompi = threading.Event()
+        self.richiesta = time.perf_counter()
+        self.inizio = None
+        self.risultato = None
+        self._avvia_thread()
+
+    def _avvia_thread(self):
+        # Il giocatore (ad esempio l'albero di MCTS) non è mai usato da due thread insieme
+        if self.in_attesa is None or (self.thread is not None and self.thread.is_alive()):
+            return
+        self.thread = threading.Thread(target=self._pensa, args=(self.in_attesa, self.interrompi), daemon=True)
+        self.in_attesa = None
+        self.thread.start()
+
+    def _pensa(self, stato, interrompi):
+        self.inizio = time.perf_counter()
+        try:
+            if self.interrompibile:
+                mossa = self.giocatore.choose_move(stato, self.tempo, interrompi=interrompi)
+            else:
+                mossa = self.giocatore.choose_move(stato, self.tempo)
+            risultato = (mossa, None)
+        except Exception as e:
+            risultato = (None, e)
+        if not interrompi.is_set():
+            self.risultato = risultato
+
+    def annulla(self):
+        """Ferma e scarta la ricerca in corso o in attesa (ad esempio dopo un annullamento della mossa)."""
+        if self.interrompi is not None:
+            self.interrompi.set()
+            self.interrompi = None
+        self.in_attesa = None
+
+    def mossa(self):
+        """La mossa scelta, oppure None se il giocatore sta ancora pensando."""
+        if self.interrompi is None:
+            return None
+        self._avvia_thread()
+        if self.risultato is not None:
+            self.interrompi = None
+            mossa, errore = self.risultato
+            if errore is not None:
+                raise errore
+            return mossa
+        inizio = self.richiesta if self.in_attesa is not None or self.inizio is None else self.inizio
+        if time.perf_counter() >= inizio + self.tempo + self.tolleranza:
+            self.annulla()
+            return self.stato.random_legal_move(rnd)
+        return None
+
+    def close(self):
+        self.annulla()
@@ -0,0 +1,417 @@
+'''
+Logica di gioco del Tris e del Trissone (Ultimate Tic Tac Toe), senza grafica:
+importare questo modulo non carica matplotlib né altre librerie di visualizzazione.
+La grafica è in Grafica.py, la simulazione da riga di comando in Trissone.py.
+'''
+import numpy as np
+import bisect
+import random as rnd
+# Le combinazioni vincenti (per mini board e per il Trissone) sono definite in Tabelle,
+# insieme alle tabelle precalcolate degli esiti dei mini board
+from Tabelle import PosizioniVincenti, Potenze3, EsitoTris, LineaTris, VincibileTris, LineaVincente, codice
+
+# Per ogni cella (0-8), indici delle combinazioni vincenti che la contengono
+LineePerCella = [[i for i, item in enumerate(PosizioniVincenti) if cella in item] for cella in range(9)]
+
+# Vocabolario dei giocatori
+VocGiocatori = {1: "cerchio", 2: "ics", 3: "pareggio"}
+
+# Chiavi di Zobrist, generate con un seme fisso così che gli hash siano uguali in ogni processo:
+# ZobristTris[cella][giocatore] per il Tris, ZobristCelle[board][cella][giocatore] per il Trissone
+# (giocatore 0 = cella vuota, chiave nulla) e ZobristNext[next] per il vincolo (indice 9: scelta libera)
+_zobrist = rnd.Random(0x7215)
+ZobristTris = [[0, _zobrist.getrandbits(64), _zobrist.getrandbits(64)] for _ in range(9)]
+ZobristCelle = [[[0, _zobrist.getrandbits(64), _zobrist.getrandbits(64)] for _ in range(9)] for _ in range(9)]
+ZobristNext = [_zobrist.getrandbits(64) for _ in range(10)]
+
+
+class Tris:
+    '''
+    Classe che definisce una partita di tris (mini board).
+    Per convenzione, inizia sempre il cerchio.
+    '''
+    def __init__(self):
+        self.pos = np.zeros(9, dtype=int)
+        self.fine = False
+        self.vincitore = 0
+        self.tris = None  # Salva la combinazione vincente se presente
+        # Codice in base 3 della posizione, aggiornato a ogni mossa (indice delle tabelle in Tabelle)
+        self.codice = 0
+        self.mosse = 0
+        self.libere = list(range(9))  # Celle ancora libere, aggiornate a ogni mossa
+        # Pile per annulla/ripeti: contengono solo interi piccoli, quindi push e pop non allocano
+        self.storia = []     # Celle giocate, in ordine
+        self.annullate = []  # Mosse annullate (posizione * 2 + giocatore - 1), per redo
+        self.hash = 0  # Hash di Zobrist della posizione, aggiornato a ogni mossa
+
+    @classmethod
+    def da_celle(cls, celle):
+        """
+        Costruisce un tris dalle 9 celle (0 vuota, 1 O, 2 X). Lo stato coincide con quello
+        ottenuto giocando le mosse, tranne la pila di annullamento, che resta vuota.
+        """
+        tris = cls()
+        for posizione, giocatore in enumerate(celle):
+            giocatore = int(giocatore)
+            if giocatore:
+                tris.pos[posizione] = giocatore
+                tris.mosse += 1
+                tris.libere.remove(posizione)
+                tris.hash ^= ZobristTris[posizione][giocatore]
+                tris.codice += giocatore * Potenze3[posizione]
+        tris._Aggiorna()
+        return tris
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, altro):
+        if not isinstance(altro, Tris):
+            return NotImplemented
+        return self.hash == altro.hash and (self.pos == altro.pos).all()
+
+    def Check(self):
+        # Ricalcola il codice dalla posizione e legge l'esito dalle tabelle
+        self.codice = codice(self.pos)
+        if not self.fine:
+            self._Aggiorna()
+
+    def add(self, cerchio: bool, posizione: int):
+        self._gioca(cerchio, posizione)
+        # Dopo una mossa nuova le mosse annullate non si possono più ripetere
+        if self.annullate:
+            self.annullate.clear()
+
+    def _gioca(self, cerchio, posizione):
+        if posizione < 0 or posizione > 8:
+            raise IndexError("Posizione non valida")
+        if self.fine:
+            raise IndexError("Tris già finito")
+        if self.pos[posizione] != 0:
+            raise IndexError("Posizione non valida")
+        giocatore = 1 if cerchio else 2
+        self.pos[posizione] = giocatore
+        self.mosse += 1
+        self.libere.remove(posizione)
+        self.storia.append(posizione)
+        self.hash ^= ZobristTris[posizione][giocatore]
+        self.codice += giocatore * Potenze3[posizione]
+        self._Aggiorna()
+
+    def unmake(self):
+        """Annulla l'ultima mossa, ripristinando esattamente lo stato precedente, in O(1)."""
+        if not self.storia:
+            raise IndexError("Nessuna mossa da annullare")
+        posizione = self.storia.pop()
+        giocatore = int(self.pos[posizione])
+        self.pos[posizione] = 0
+        self.mosse -= 1
+        bisect.insort(self.libere, posizione)
+        self.hash ^= ZobristTris[posizione][giocatore]
+        self.codice -= giocatore * Potenze3[posizione]
+        # Prima della mossa il tris non poteva essere finito
+        self.fine = False
+        self.vincitore = 0
+        self.tris = None
+        self.annullate.append(posizione * 2 + giocatore - 1)
+
+    def redo(self):
+        """Ripete l'ultima mossa annullata con unmake."""
+        if not self.annullate:
+            raise IndexError("Nessuna mossa da ripetere")
+        posizione, giocatore = divmod(self.annullate.pop(), 2)
+        self._gioca(giocatore == 0, posizione)
+
+    def legal_moves(self):
+        """Restituisce la lista (da non modificare) delle celle giocabili."""
+        return [] if self.fine else self.libere
+
+    def random_legal_move(self, rng):
+        """Estrae una cella giocabile a caso usando 'rng' (random.Random o il modulo random)."""
+        return rng.choice(self.legal_moves())
+
+    @property
+    def morto(self):
+        """Vero se il tris è ancora aperto ma nessuno dei due giocatori può più completare una linea."""
+        return not self.fine and not VincibileTris[self.codice]
+
+    def _Aggiorna(self):
+        """
+        Verifica dopo una mossa: l'esito e la linea vincente si leggono dalle tabelle
+        precalcolate a partire dal codice della posizione (equivalente a scandire le linee).
+        """
+        esito = EsitoTris[self.codice]
+        if esito:
+            self.fine = True
+            self.vincitore = VocGiocatori[esito]
+            if esito != 3:
+                self.tris = PosizioniVincenti[LineaTris[self.codice]]
+
+class Trissone:
+    '''
+    Classe che definisce il Trissone (Ultimate Tic Tac Toe),
+    composto da 9 mini board (Tris).
+    Con patte=True la partita finisce in pareggio appena nessuno dei due giocatori può più
+    completare una linea grande: un mini board "morto" (in cui nessuno può più fare tris)
+    blocca le linee di entrambi ma resta giocabile, quindi le regole e i risultati non cambiano,
+    le partite senza vincitore possibile si fermano solo prima.
+    '''
+    def __init__(self, patte=False):
+        # Inizializza 9 mini board
+        self.pos = np.array([Tris() for _ in range(9)])
+        self.fine = False
+        self.vincitore = 0
+        self.next = None  # Indica l'indice del mini board in cui dovrà essere giocata la prossima mossa
+        self.tris = None  # Salva la combinazione vincente a livello di Trissone
+        # Contatori incrementali: per ogni giocatore (1, 2) quanti mini board vinti ha su ogni linea
+        self.conta = [None, [0] * 8, [0] * 8]
+        self.chiusi = 0  # Numero di mini board conclusi
+        self.patte = patte
+        # Solo in modalità patte: maschere a 9 bit dei mini board che il cerchio / l'ics possono ancora far propri
+        self.vivi_o = 0x1FF
+        self.vivi_x = 0x1FF
+        self._mosse = None  # Cache delle mosse legali, invalidata a ogni mossa
+        # Pile per annulla/ripeti, con soli interi piccoli (nessuna allocazione per mossa):
+        # storia contiene, per ogni mossa, posGrande * 9 + posizione seguito dal next precedente
+        self.storia = []
+        self.annullate = []  # (posGrande * 9 + posizione) * 2 + giocatore - 1, per redo
+        # Hash di Zobrist della posizione, compreso il vincolo next, aggiornato a ogni mossa
+        self.hash = ZobristNext[9]
+
+    @classmethod
+    def da_celle(cls, celle, next=None, patte=False):
+        """
+        Costruisce un Trissone dalle 81 celle (come restituite da celle()) e dal vincolo next.
+        Lo stato coincide con quello ottenuto giocando le mosse, tranne le pile di annullamento,
+        che restano vuote.
+        """
+        partita = cls(patte)
+        for i in range(9):
+            board = Tris.da_celle(celle[i * 9:i * 9 + 9])
+            partita.pos[i] = board
+            for posizione, giocatore in enumerate(board.pos):
+                partita.hash ^= ZobristCelle[i][posizione][int(giocatore)]
+        for i, board in enumerate(partita.pos):
+            if board.fine:
+                partita._Aggiorna(i)
+        if partita.tris is not None:
+            # Con più linee complete vale la prima, come quando la partita si gioca mossa per mossa
+            partita.tris = [linea for linea in PosizioniVincenti
+                            if all(partita.pos[k].vincitore == partita.vincitore for k in linea)][0]
+        if patte and not partita.fine:
+            for i in range(9):
+                partita._Vivi(i)
+        partita.next = next
+        partita.hash ^= ZobristNext[9] ^ ZobristNext[9 if next is None else next]
+        return partita
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, altro):
+        if not isinstance(altro, Trissone):
+            return NotImplemented
+        return (self.hash == altro.hash and self.next == altro.next
+                and all((a.pos == b.pos).all() for a, b in zip(self.pos, altro.pos)))
+
+    def Check(self):
+        # Aggiorna lo stato di ogni mini board
+        for piccolo in self.pos:
+            piccolo.Check()
+        # Creiamo un array "stato" per i mini board: 0 se non concluso, 1 o 2 se vinto
+        stato = np.zeros(9, dtype=int)
+        for i, board in enumerate(self.pos):
+            if board.vincitore == VocGiocatori[1]:
+                stato[i] = 1
+            elif board.vincitore == VocGiocatori[2]:
+                stato[i] = 2
+        # in caso di pareggio o ancora non finito rimane 0
+        # Verifica se esiste un tris vincente a livello di mini board
+        vinto = False
+        for item in PosizioniVincenti:
+            if stato[item[0]] == stato[item[1]] == stato[item[2]] != 0:
+                self.fine = True
+                self.vincitore = VocGiocatori[stato[item[0]]]
+                self.tris = item  # Combinazione vincente (gli indici dei mini board)
+                vinto = True
+                break
+        # Se tutti i mini board sono conclusi e non c'è un vincitore, il Trissone è un pareggio
+        if (not vinto) and all(board.fine for board in self.pos):
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+        elif (not vinto) and self.patte:
+            self.vivi_o = self.vivi_x = 0x1FF
+            for i in range(9):
+                self._Vivi(i)
+
+    def add(self, cerchio: bool, posizione: int, posGrande: int):
+        """
+        Aggiunge una mossa nel Trissone.
+          - cerchio: True se gioca il cerchio, False se gioca "ics"
+          - posizione: posizione (0-8) all'interno del mini board
+          - posGrande: indice del mini board scelto (usato solo se self.next è None)
+        """
+        self._gioca(cerchio, posizione, posGrande)
+        # Dopo una mossa nuova le mosse annullate non si possono più ripetere
+        if self.annullate:
+            self.annullate.clear()
+
+    def _gioca(self, cerchio, posizione, posGrande):
+        if posizione < 0 or posizione > 8 or posGrande < 0 or posGrande > 8:
+            raise IndexError("Posizione non valida, out of bound")
+        if self.fine:
+            raise IndexError("Trissone già finito")
+
+        # Determina in quale mini board effettuare la mossa
+        # (una mossa non valida non modifica lo stato, nemmeno il vincolo next)
+        if self.next is not None and posGrande != self.next:
+            raise IndexError("Non è qui che devi giocare!!!")
+        
+        board_index = posGrande
+
+        if (self.pos[board_index].fine):
+            raise IndexError("Tris piccolo già finito")
+
+        mini_board = self.pos[board_index]
+        if mini_board.pos[posizione] != 0:
+            raise IndexError("Posizione non valida")
+        self._mosse = None
+        next_prima = self.next
+        # Aggiunge la mossa al mini board scelto
+        mini_board.add(cerchio, posizione)
+        self.storia.append(board_index * 9 + posizione)
+        self.storia.append(next_prima)
+        # Imposta la prossima mossa nel mini board corrispondente alla cella appena giocata
+        self.next = posizione
+        if self.pos[self.next].fine:
+            self.next=None
+        self.hash ^= (ZobristCelle[board_index][posizione][1 if cerchio else 2]
+                      ^ ZobristNext[9 if next_prima is None else next_prima]
+                      ^ ZobristNext[9 if self.next is None else self.next])
+
+        # Il Trissone può cambiare solo se il mini board giocato si è appena concluso
+        if mini_board.fine:
+            self._Aggiorna(board_index)
+        if self.patte and not self.fine:
+            self._Vivi(board_index)
+
+    def celle(self):
+        """Posizione come tupla di 81 valori (indice posGrande * 9 + posizione; 0 vuota, 1 O, 2 X)."""
+        return tuple(int(v) for board in self.pos for v in board.pos)
+
+    @property
+    def mosse(self):
+        """Numero di mosse giocate (il cerchio muove quando è pari), come TrissoneBit.mosse."""
+        return sum(board.mosse for board in self.pos)
+
+    def mosse_giocate(self):
+        """Lista delle mosse giocate, in ordine, come interi posGrande * 9 + posizione."""
+        return self.storia[0::2]
+
+    def unmake(self):
+        """
+        Annulla l'ultima mossa ripristinando esattamente pos, fine, vincitore, tris e next.
+        Costa O(1) e non alloca memoria: le pile contengono solo interi piccoli.
+        """
+        if not self.storia:
+            raise IndexError("Nessuna mossa da annullare")
+        next_prima = self.storia.pop()
+        posGrande, posizione = divmod(self.storia.pop(), 9)
+        mini_board = self.pos[posGrande]
+        giocatore = int(mini_board.pos[posizione])
+        # Se la mossa aveva concluso il mini board, va annullato anche il suo effetto sul Trissone
+        if mini_board.fine:
+            self._Annulla(posGrande)
+        elif self.fine:
+            # Partita chiusa in anticipo in modalità patte: prima della mossa era ancora aperta
+            self.fine = False
+            self.vincitore = 0
+        mini_board.unmake()
+        if self.patte:
+            self._Vivi(posGrande)
+        self.hash ^= (ZobristCelle[posGrande][posizione][giocatore]
+                      ^ ZobristNext[9 if self.next is None else self.next]
+                      ^ ZobristNext[9 if next_prima is None else next_prima])
+        self.next = next_prima
+        self._mosse = None
+        self.annullate.append((posGrande * 9 + posizione) * 2 + giocatore - 1)
+
+    def redo(self):
+        """Ripete l'ultima mossa annullata con unmake."""
+        if not self.annullate:
+            raise IndexError("Nessuna mossa da ripetere")
+        mossa, giocatore = divmod(self.annullate.pop(), 2)
+        posGrande, posizione = divmod(mossa, 9)
+        self._gioca(giocatore == 0, posizione, posGrande)
+
+    def legal_moves(self):
+        """
+        Restituisce la lista (da non modificare) delle mosse legali come coppie
+        (posGrande, posizione). La lista è calcolata una sola volta per posizione.
+        """
+        if self._mosse is None:
+            if self.fine:
+                self._mosse = []
+            elif self.next is not None:
+                self._mosse = [(self.next, cella) for cella in self.pos[self.next].libere]
+            else:
+                self._mosse = [(i, cella) for i, board in enumerate(self.pos) if not board.fine
+                               for cella in board.libere]
+        return self._mosse
+
+    def random_legal_move(self, rng):
+        """Estrae una mossa legale (posGrande, posizione) a caso usando 'rng'."""
+        return rng.choice(self.legal_moves())
+
+    def _Aggiorna(self, indice):
+        """
+        Verifica incrementale dopo la conclusione del mini board 'indice':
+        controlla solo le linee grandi che passano per quel mini board (equivalente a Check).
+        """
+        self.chiusi += 1
+        vincitore = self.pos[indice].vincitore
+        if vincitore != VocGiocatori[3]:
+            giocatore = 1 if vincitore == VocGiocatori[1] else 2
+            conta = self.conta[giocatore]
+            # Tutti i contatori vengono aggiornati, così _Annulla può semplicemente decrementarli
+            for linea in LineePerCella[indice]:
+                conta[linea] += 1
+                if conta[linea] == 3 and not self.fine:
+                    self.fine = True
+                    self.vincitore = vincitore
+                    self.tris = PosizioniVincenti[linea]
+        if self.chiusi == 9 and not self.fine:
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+
+    def _Vivi(self, indice):
+        """
+        Modalità patte: aggiorna vivi_o / vivi_x per il mini board 'indice' e chiude la partita
+        in pareggio se nessuna linea grande è più completabile da uno dei due giocatori.
+        """
+        board = self.pos[indice]
+        if board.vincitore == VocGiocatori[1]:
+            vincibile = 1
+        elif board.vincitore == VocGiocatori[2]:
+            vincibile = 2
+        else:
+            vincibile = VincibileTris[board.codice]  # 0 anche per i mini board pareggiati
+        bit = 1 << indice
+        self.vivi_o = self.vivi_o | bit if vincibile & 1 else self.vivi_o & ~bit
+        self.vivi_x = self.vivi_x | bit if vincibile & 2 else self.vivi_x & ~bit
+        if LineaVincente[self.vivi_o] < 0 and LineaVincente[self.vivi_x] < 0:
+            self.fine = True
+            self.vincitore = VocGiocatori[3]
+
+    def _Annulla(self, indice):
+        """Inverso di _Aggiorna: il mini board 'indice' torna aperto."""
+        self.chiusi -= 1
+        vincitore = self.pos[indice].vincitore
+        if vincitore != VocGiocatori[3]:
+            conta = self.conta[1 if vincitore == VocGiocatori[1] else 2]
+            for linea in LineePerCella[indice]:
+                conta[linea] -= 1
+        # Prima della mossa il Trissone non poteva essere finito
+        self.fine = False
+        self.vincitore = 0
+        self.tris = None
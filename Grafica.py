@@ -0,0 +1,176 @@
+'''
+Grafica matplotlib di Tris e Trissone (viste persistenti aggiornate con il blitting).
+È importata da Trissone.py solo quando serve disegnare (-show).
+'''
+import matplotlib.pyplot as plt
+
+
+# Simbolo disegnato per ogni valore di cella
+SIMBOLI = {0: "", 1: "O", 2: "X"}
+
+
+class _Vista:
+    '''
+    Base delle viste matplotlib: gli artisti dinamici (simboli, rettangoli, testo finale)
+    sono creati una sola volta come "animated" e ridisegnati con il blitting sopra
+    uno sfondo salvato (la griglia), senza ridisegnare l'intera figura.
+    '''
+    def __init__(self, fig):
+        self.fig = fig
+        self.fig.clf()
+        self.ax = self.fig.gca()
+        self.animati = []
+        self.sfondo = None
+        # A ogni ridisegno completo (prima apertura, ridimensionamento) si salva il nuovo sfondo
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _animato(self, artista):
+        artista.set_animated(True)
+        self.animati.append(artista)
+        return artista
+
+    def _on_draw(self, event):
+        self.sfondo = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._disegna_animati()
+
+    def _disegna_animati(self):
+        for artista in self.animati:
+            if artista.get_visible():
+                self.fig.draw_artist(artista)
+
+    def _ridisegna(self):
+        canvas = self.fig.canvas
+        if self.sfondo is None:
+            canvas.draw()  # Il primo disegno completo salva lo sfondo tramite _on_draw
+        else:
+            canvas.restore_region(self.sfondo)
+            self._disegna_animati()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+    def attendi(self, showtime):
+        """Mantiene la finestra reattiva per 'showtime' secondi (come plt.pause, ma senza ridisegnare)."""
+        if showtime > 0 and self.fig.canvas.manager is not None:
+            self.fig.canvas.start_event_loop(showtime)
+
+
+class VistaTris(_Vista):
+    '''Vista persistente del tris classico (griglia 3x3).'''
+    def __init__(self, fig):
+        super().__init__(fig)
+        ax = self.ax
+        # Griglia statica
+        ax.plot([1, 1], [0, 3], color='black', linewidth=2)
+        ax.plot([2, 2], [0, 3], color='black', linewidth=2)
+        ax.plot([0, 3], [1, 1], color='black', linewidth=2)
+        ax.plot([0, 3], [2, 2], color='black', linewidth=2)
+        ax.set_xlim(0, 3)
+        ax.set_ylim(0, 3)
+        ax.axis('off')
+        self.testi = []
+        self.rettangoli = []
+        for idx in range(9):
+            i, j = divmod(idx, 3)
+            # Posizionamento: le righe vengono visualizzate dall'alto verso il basso
+            self.testi.append(self._animato(ax.text(j + 0.5, 2.5 - i, "", fontsize=40, ha='center', va='center')))
+            rect = plt.Rectangle((j, 2 - i), 1, 1, fill=False, edgecolor='red', linewidth=3, visible=False)
+            self.rettangoli.append(self._animato(ax.add_patch(rect)))
+        self.didascalia = self._animato(self.fig.text(0.5, 0.01, "", ha="center", fontsize=16, color='red'))
+
+    def aggiorna(self, pos, winning_positions=None):
+        for idx in range(9):
+            simbolo = SIMBOLI[int(pos[idx])]
+            if self.testi[idx].get_text() != simbolo:
+                self.testi[idx].set_text(simbolo)
+            self.rettangoli[idx].set_visible(winning_positions is not None and idx in winning_positions)
+        self.didascalia.set_text(f"Tris vincente: {winning_positions}" if winning_positions is not None else "")
+        self._ridisegna()
+
+
+class VistaTrissone(_Vista):
+    '''Vista persistente del Trissone: 81 testi, 81 rettangoli rossi e 9 blu creati una volta.'''
+    def __init__(self, fig):
+        super().__init__(fig)
+        ax = self.ax
+        # L'intero tabellone è formato da una griglia 9x9 (ogni mini board è 3x3)
+        # Linee sottili (griglia interna di ogni mini board)
+        for x in range(10):
+            ax.plot([x, x], [0, 9], color='gray', linewidth=1)
+        for y in range(10):
+            ax.plot([0, 9], [y, y], color='gray', linewidth=1)
+        # Linee spesse per delimitare i 9 mini board
+        for x in [0, 3, 6, 9]:
+            ax.plot([x, x], [0, 9], color='black', linewidth=3)
+        for y in [0, 3, 6, 9]:
+            ax.plot([0, 9], [y, y], color='black', linewidth=3)
+        ax.set_xlim(0, 9)
+        ax.set_ylim(0, 9)
+        ax.axis('off')
+
+        self.testi = []       # Indice: big_idx * 9 + mini_idx
+        self.rettangoli = []  # Celle vincenti dei mini board (rossi)
+        self.grandi = []      # Mini board vincenti del Trissone (blu)
+        for big_idx in range(9):
+            big_row, big_col = divmod(big_idx, 3)
+            x_offset = big_col * 3
+            y_offset = (2 - big_row) * 3  # in modo che la riga 0 appaia in alto
+            for mini_idx in range(9):
+                i, j = divmod(mini_idx, 3)
+                testo = ax.text(x_offset + j + 0.5, y_offset + (2.5 - i), "", fontsize=20, ha='center', va='center')
+                self.testi.append(self._animato(testo))
+                rect = plt.Rectangle((x_offset + j, y_offset + (2 - i)), 1, 1, fill=False, edgecolor='red', linewidth=2, visible=False)
+                self.rettangoli.append(self._animato(ax.add_patch(rect)))
+            rect = plt.Rectangle((x_offset, y_offset), 3, 3, fill=False, edgecolor='blue', linewidth=3, visible=False)
+            self.grandi.append(self._animato(ax.add_patch(rect)))
+        self.didascalia = self._animato(self.fig.text(0.5, 0.01, "", ha="center", fontsize=16, color='blue'))
+
+    def aggiorna(self, trissone, winning_positions_big=None):
+        for big_idx, mini_board in enumerate(trissone.pos):
+            tris = mini_board.tris or ()
+            pos = mini_board.pos
+            for mini_idx in range(9):
+                k = big_idx * 9 + mini_idx
+                simbolo = SIMBOLI[int(pos[mini_idx])]
+                if self.testi[k].get_text() != simbolo:
+                    self.testi[k].set_text(simbolo)
+                self.rettangoli[k].set_visible(mini_idx in tris)
+            self.grandi[big_idx].set_visible(winning_positions_big is not None and big_idx in winning_positions_big)
+        if winning_positions_big is not None:
+            self.didascalia.set_text(f"Tris vincente nel Trissone: {winning_positions_big}")
+        else:
+            self.didascalia.set_text("")
+        self._ridisegna()
+
+
+def _vista(classe):
+    """Vista di tipo 'classe' associata alla figura corrente (creata al primo uso)."""
+    fig = plt.gcf()
+    vista = getattr(fig, "_vista_trissone", None)
+    if not isinstance(vista, classe):
+        vista = classe(fig)
+        fig._vista_trissone = vista
+    return vista
+
+def draw_board(pos, winning_positions=None, showtime=0):
+    """
+    Disegna graficamente il tris:
+      - pos: array 1D di 9 elementi (0: vuota, 1: O, 2: X) oppure un'istanza di Tris
+      - winning_positions: se non None, evidenzia le celle vincenti e mostra il tris vincente
+    La griglia e i simboli sono creati alla prima chiamata (VistaTris); le successive
+    aggiornano solo gli artisti cambiati.
+    """
+    vista = _vista(VistaTris)
+    vista.aggiorna(getattr(pos, "pos", pos), winning_positions)
+    vista.attendi(showtime)
+
+def draw_big_board(trissone, winning_positions_big=None, showtime=0):
+    """
+    Disegna graficamente il Trissone (Ultimate Tic Tac Toe).
+      - trissone: istanza della classe Trissone
+      - winning_positions_big: se non None, evidenzia (con rettangoli blu) i mini board vincenti e mostra il tris vincente
+    La griglia e gli 81 simboli sono creati alla prima chiamata (VistaTrissone); le successive
+    aggiornano solo gli artisti cambiati.
+    """
+    vista = _vista(VistaTrissone)
+    vista.aggiorna(trissone, winning_positions_big)
+    vista.attendi(showtime)
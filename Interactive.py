@@ -1,7 +1,10 @@
 import pygame
 import sys
+import argparse
 import numpy as np
-from Trissone import Tris, Trissone
+from Gioco import Tris, Trissone
+from Giocatori import GIOCATORI, Pensatore, crea_giocatore, gioca
+from Salvataggio import codifica, decodifica
 
 pygame.init()
 
@@ -30,6 +33,14 @@ VocGiocatori = {1: "cerchio", 2: "ics", 3: "pareggio"}
 button1_rect = pygame.Rect(150, 200, 300, 80)  # Pulsante 1
 button2_rect = pygame.Rect(150, 320, 300, 80)  # Pulsante 2
 
+# File per mettere in pausa (S) e riprendere (L) la partita
+SALVATAGGIO = "partita_salvata.bin"
+
+# Eventi dopo cui il contenuto della finestra va ridisegnato per intero (finestra scoperta o ripristinata);
+# i nomi WINDOW* esistono solo da pygame 2
+ESPOSIZIONE = tuple(getattr(pygame, nome) for nome in ("VIDEOEXPOSE", "WINDOWEXPOSED", "WINDOWRESTORED", "WINDOWSHOWN")
+	if hasattr(pygame, nome))
+
 # Font
 font = pygame.font.SysFont(None, 48)
 error_font = pygame.font.SysFont(None, 36)
@@ -44,118 +55,151 @@ def set_error(message, duration=1000):
 	error_message = message
 	error_expire_time = pygame.time.get_ticks() + duration
 
-def display_error(screen):
-	"""Disegna il messaggio d'errore, se impostato e non scaduto, sullo schermo."""
-	global error_message, error_expire_time
-	current_time = pygame.time.get_ticks()
-	if error_message and current_time < error_expire_time:
-		text_surface = error_font.render(error_message, True, RED)
-		text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-		screen.blit(text_surface, text_rect)
-	elif current_time >= error_expire_time:
+def current_error():
+	"""Restituisce il messaggio d'errore attivo ('' se non impostato o già scaduto)."""
+	global error_message
+	if error_message and pygame.time.get_ticks() >= error_expire_time:
 		error_message = ""  # Resetta il messaggio dopo la scadenza
+	return error_message
 
-def draw_board(screen, game):
-	"""Disegna il tabellone classico 3x3 (Tris)."""
-	screen.fill(BG_COLOR)
-	# Disegna la griglia principale
-	pygame.draw.line(screen, LINE_COLOR, (CELL_SIZE, 0), (CELL_SIZE, HEIGHT), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (2 * CELL_SIZE, 0), (2 * CELL_SIZE, HEIGHT), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (0, CELL_SIZE), (WIDTH, CELL_SIZE), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (0, 2 * CELL_SIZE), (WIDTH, 2 * CELL_SIZE), LINE_WIDTH)
-	
-	# Disegna i simboli
-	for idx, val in enumerate(game.pos):
-		row = idx // 3
-		col = idx % 3
-		center_x = col * CELL_SIZE + CELL_SIZE // 2
-		center_y = row * CELL_SIZE + CELL_SIZE // 2
-		if val == 1:
-			pygame.draw.circle(screen, BLUE, (center_x, center_y), CELL_SIZE // 3, LINE_WIDTH)
-		elif val == 2:
-			offset = CELL_SIZE // 3
-			start_pos1 = (col * CELL_SIZE + offset, row * CELL_SIZE + offset)
-			end_pos1   = ((col + 1) * CELL_SIZE - offset, (row + 1) * CELL_SIZE - offset)
-			start_pos2 = (col * CELL_SIZE + offset, (row + 1) * CELL_SIZE - offset)
-			end_pos2   = ((col + 1) * CELL_SIZE - offset, row * CELL_SIZE + offset)
-			pygame.draw.line(screen, RED, start_pos1, end_pos1, LINE_WIDTH)
-			pygame.draw.line(screen, RED, start_pos2, end_pos2, LINE_WIDTH)
-	
-	# Evidenzia la combinazione vincente, se esiste
-	if game.tris is not None:
-		for idx in game.tris:
-			row = idx // 3
-			col = idx % 3
-			rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-			pygame.draw.rect(screen, (0, 255, 0), rect, 5)
-
-def draw_big_board(screen, game):
+def draw_symbol(screen, rect, val, line_width):
+	"""Disegna il simbolo 'val' (1: cerchio, 2: ics) al centro della cella 'rect'."""
+	size = rect.width
+	if val == 1:
+		pygame.draw.circle(screen, BLUE, rect.center, size // 3, line_width)
+	elif val == 2:
+		offset = size // 3
+		pygame.draw.line(screen, RED, (rect.x + offset, rect.y + offset), (rect.right - offset, rect.bottom - offset), line_width)
+		pygame.draw.line(screen, RED, (rect.x + offset, rect.bottom - offset), (rect.right - offset, rect.y + offset), line_width)
+
+class Renderer:
 	"""
-	Disegna il Trissone (Ultimate Tic Tac Toe).
-	'game' è un'istanza della classe Trissone che contiene 9 mini board (ogni mini board è un Tris).
+	Disegna il Tris o il Trissone ridisegnando solo ciò che è cambiato dall'ultimo frame.
+	La griglia statica è pre-renderizzata in una superficie, usata anche per cancellare le celle;
+	aggiorna() restituisce i rettangoli modificati da passare a pygame.display.update.
+	"""
+	def __init__(self, screen, bigMode):
+		self.screen = screen
+		self.bigMode = bigMode
+		self.sfondo = pygame.Surface(screen.get_size())
+		self.sfondo.fill(BG_COLOR)
+		self.rects = []  # Rettangolo di ogni cella (9 per il Tris, 81 per il Trissone: board * 9 + cella)
+		if bigMode:
+			mini_size = WIDTH // 3      # Dimensione in pixel di ogni mini board
+			cell_size = mini_size // 3   # Dimensione in pixel di ogni cella interna al mini board
+			self.spessore = 3            # Spessore delle linee dei simboli e delle celle vincenti
+			# Linee spesse che separano i mini board
+			pygame.draw.line(self.sfondo, LINE_COLOR, (mini_size, 0), (mini_size, HEIGHT), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (2 * mini_size, 0), (2 * mini_size, HEIGHT), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (0, mini_size), (WIDTH, mini_size), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (0, 2 * mini_size), (WIDTH, 2 * mini_size), LINE_WIDTH)
+			self.boards = []
+			for big_idx in range(9):
+				x_offset = (big_idx % 3) * mini_size
+				y_offset = (big_idx // 3) * mini_size
+				self.boards.append(pygame.Rect(x_offset, y_offset, mini_size, mini_size))
+				# Griglia interna del mini board (linee sottili)
+				pygame.draw.line(self.sfondo, LINE_COLOR, (x_offset + cell_size, y_offset), (x_offset + cell_size, y_offset + mini_size), self.spessore)
+				pygame.draw.line(self.sfondo, LINE_COLOR, (x_offset + 2 * cell_size, y_offset), (x_offset + 2 * cell_size, y_offset + mini_size), self.spessore)
+				pygame.draw.line(self.sfondo, LINE_COLOR, (x_offset, y_offset + cell_size), (x_offset + mini_size, y_offset + cell_size), self.spessore)
+				pygame.draw.line(self.sfondo, LINE_COLOR, (x_offset, y_offset + 2 * cell_size), (x_offset + mini_size, y_offset + 2 * cell_size), self.spessore)
+				for idx in range(9):
+					self.rects.append(pygame.Rect(x_offset + (idx % 3) * cell_size, y_offset + (idx // 3) * cell_size, cell_size, cell_size))
+		else:
+			self.spessore = LINE_WIDTH
+			self.boards = []
+			pygame.draw.line(self.sfondo, LINE_COLOR, (CELL_SIZE, 0), (CELL_SIZE, HEIGHT), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (2 * CELL_SIZE, 0), (2 * CELL_SIZE, HEIGHT), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (0, CELL_SIZE), (WIDTH, CELL_SIZE), LINE_WIDTH)
+			pygame.draw.line(self.sfondo, LINE_COLOR, (0, 2 * CELL_SIZE), (WIDTH, 2 * CELL_SIZE), LINE_WIDTH)
+			for idx in range(9):
+				self.rects.append(pygame.Rect((idx % 3) * CELL_SIZE, (idx // 3) * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+		self.invalida()
+
+	def invalida(self):
+		"""Forza il ridisegno completo al prossimo aggiorna()."""
+		self.visti = [None] * len(self.rects)  # (valore, evidenziata) disegnato per ogni cella
+		self.tris_grande = ()                    # Mini board evidenziati come tris del Trissone
+		self.errore = ("", None)                 # Messaggio mostrato e suo rettangolo
+		self.completo = True
+
+	def _celle(self, game):
+		"""Per ogni cella la coppia (valore, evidenziata come parte di un tris)."""
+		if not self.bigMode:
+			tris = game.tris or ()
+			return [(int(v), i in tris) for i, v in enumerate(game.pos)]
+		stato = []
+		for mini_board in game.pos:
+			tris = mini_board.tris or ()
+			stato.extend((int(v), i in tris) for i, v in enumerate(mini_board.pos))
+		return stato
+
+	def aggiorna(self, game):
+		"""Ridisegna le parti cambiate e restituisce la lista dei rettangoli modificati."""
+		screen = self.screen
+		stato = self._celle(game)
+		tris_grande = tuple(game.tris) if self.bigMode and game.tris is not None else ()
+		messaggio = current_error()
+
+		# Aree da ripristinare dallo sfondo: celle cambiate, mini board con evidenziazione cambiata,
+		# vecchio messaggio se il testo è cambiato
+		if self.completo:
+			aree = [screen.get_rect()]
+			self.completo = False
+		else:
+			aree = [self.rects[i] for i in range(len(stato)) if stato[i] != self.visti[i]]
+			for big_idx in set(tris_grande).symmetric_difference(self.tris_grande):
+				aree.append(self.boards[big_idx])
+			if messaggio != self.errore[0] and self.errore[1] is not None:
+				aree.append(self.errore[1])
+		# Il messaggio va ridisegnato (ripristinando prima ciò che copre) se è nuovo
+		# o se qualcosa sotto di lui viene ridisegnato
+		text_surface = rect_errore = None
+		if messaggio:
+			text_surface = error_font.render(messaggio, True, RED)
+			rect_errore = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+			if messaggio != self.errore[0]:
+				aree.append(rect_errore)
+		if not aree:
+			return []
+		sporche = [i for i, rect in enumerate(self.rects) if rect.collidelist(aree) != -1]
+		if rect_errore is not None and rect_errore not in aree:
+			sotto = [self.rects[i] for i in sporche] + [self.boards[big_idx] for big_idx in tris_grande]
+			if rect_errore.collidelist(sotto) != -1:
+				aree.append(rect_errore)
+				sporche = [i for i, rect in enumerate(self.rects) if rect.collidelist(aree) != -1]
+
+		for area in aree:
+			screen.blit(self.sfondo, area, area)
+		modificati = list(aree)
+		# Ogni cella toccata da un'area ripristinata viene ridisegnata per intero
+		for i in sporche:
+			rect = self.rects[i]
+			val, evidenziata = stato[i]
+			screen.blit(self.sfondo, rect, rect)
+			draw_symbol(screen, rect, val, self.spessore)
+			if evidenziata:
+				pygame.draw.rect(screen, (0, 255, 0), rect, 5 if not self.bigMode else 3)
+			modificati.append(rect)
+		# Se il Trissone è vinto globalmente, evidenzia i mini board vincenti
+		for big_idx in tris_grande:
+			if self.boards[big_idx].collidelist(modificati) != -1:
+				pygame.draw.rect(screen, (0, 0, 255), self.boards[big_idx], 5)
+		# Il messaggio d'errore va sopra a tutto
+		if rect_errore is not None and rect_errore in aree:
+			screen.blit(text_surface, rect_errore)
+
+		self.visti = stato
+		self.tris_grande = tris_grande
+		self.errore = (messaggio, rect_errore)
+		return modificati
+
+def gameLoop(bigMode, avversario=None, tempo=1.0):
+	"""
+	Loop principale del gioco. Se 'avversario' è il nome di un giocatore (vedi Giocatori.py)
+	l'utente gioca con il cerchio e l'ics è mosso dal computer, che pensa in un thread
+	separato: il loop continua a girare a 30 FPS mentre aspetta la sua mossa.
 	"""
-	screen.fill(BG_COLOR)
-	mini_size = WIDTH // 3      # Dimensione in pixel di ogni mini board
-	cell_size = mini_size // 3   # Dimensione in pixel di ogni cella interna al mini board
-
-	# Disegna le linee spesse che separano i mini board
-	pygame.draw.line(screen, LINE_COLOR, (mini_size, 0), (mini_size, HEIGHT), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (2 * mini_size, 0), (2 * mini_size, HEIGHT), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (0, mini_size), (WIDTH, mini_size), LINE_WIDTH)
-	pygame.draw.line(screen, LINE_COLOR, (0, 2 * mini_size), (WIDTH, 2 * mini_size), LINE_WIDTH)
-	
-	# Per ogni mini board
-	for big_idx in range(9):
-		mini_board = game.pos[big_idx]  # Oggetto Tris
-		big_row = big_idx // 3
-		big_col = big_idx % 3
-		x_offset = big_col * mini_size
-		y_offset = big_row * mini_size
-		
-		# Disegna la griglia interna del mini board (linee sottili)
-		mini_line_width = 3
-		pygame.draw.line(screen, LINE_COLOR, (x_offset + cell_size, y_offset), (x_offset + cell_size, y_offset + mini_size), mini_line_width)
-		pygame.draw.line(screen, LINE_COLOR, (x_offset + 2 * cell_size, y_offset), (x_offset + 2 * cell_size, y_offset + mini_size), mini_line_width)
-		pygame.draw.line(screen, LINE_COLOR, (x_offset, y_offset + cell_size), (x_offset + mini_size, y_offset + cell_size), mini_line_width)
-		pygame.draw.line(screen, LINE_COLOR, (x_offset, y_offset + 2 * cell_size), (x_offset + mini_size, y_offset + 2 * cell_size), mini_line_width)
-		
-		# Disegna i simboli all'interno del mini board
-		for idx, val in enumerate(mini_board.pos):
-			row = idx // 3
-			col = idx % 3
-			center_x = x_offset + col * cell_size + cell_size // 2
-			center_y = y_offset + row * cell_size + cell_size // 2
-			if val == 1:
-				pygame.draw.circle(screen, BLUE, (center_x, center_y), cell_size // 3, mini_line_width)
-			elif val == 2:
-				offset = cell_size // 3
-				start_pos1 = (x_offset + col * cell_size + offset, y_offset + row * cell_size + offset)
-				end_pos1   = (x_offset + (col + 1) * cell_size - offset, y_offset + (row + 1) * cell_size - offset)
-				start_pos2 = (x_offset + col * cell_size + offset, y_offset + (row + 1) * cell_size - offset)
-				end_pos2   = (x_offset + (col + 1) * cell_size - offset, y_offset + row * cell_size + offset)
-				pygame.draw.line(screen, RED, start_pos1, end_pos1, mini_line_width)
-				pygame.draw.line(screen, RED, start_pos2, end_pos2, mini_line_width)
-		
-		# Se il mini board ha un tris vincente, evidenzia le celle vincenti
-		if mini_board.tris is not None:
-			for idx in mini_board.tris:
-				r = idx // 3
-				c = idx % 3
-				rect = pygame.Rect(x_offset + c * cell_size, y_offset + r * cell_size, cell_size, cell_size)
-				pygame.draw.rect(screen, (0, 255, 0), rect, 3)
-	
-	# Se il Trissone è vinto globalmente, evidenzia i mini board vincenti
-	if game.tris is not None:
-		for big_idx in game.tris:
-			big_row = big_idx // 3
-			big_col = big_idx % 3
-			x_offset = big_col * mini_size
-			y_offset = big_row * mini_size
-			rect = pygame.Rect(x_offset, y_offset, mini_size, mini_size)
-			pygame.draw.rect(screen, (0, 0, 255), rect, 5)
-
-def gameLoop(bigMode):
-	"""Loop principale del gioco."""
 	if bigMode:
 		game = Trissone()
 	else:
@@ -163,16 +207,38 @@ def gameLoop(bigMode):
 	
 	current_player = True  # True per il cerchio, False per l'ics; il cerchio inizia
 	running = True
+	pensatore = Pensatore(crea_giocatore(avversario, tempo=tempo), tempo) if avversario else None
 
-	# In base alla modalità scelta, usiamo la funzione di disegno corretta
-	draw_function = draw_big_board if bigMode else draw_board
+	renderer = Renderer(screen, bigMode)
+	# Il movimento del mouse non cambia il tabellone: non deve svegliare il loop
+	pygame.event.set_blocked(pygame.MOUSEMOTION)
 	fine=False
 	while running:
-		for event in pygame.event.get():
+		# Turno del computer: la ricerca parte in un thread e il loop ne controlla l'esito a ogni frame
+		turno_ai = pensatore is not None and not current_player and not game.fine
+		if turno_ai and not pensatore.attivo:
+			pensatore.avvia(game)
+		# Il loop dorme finché non arriva un evento; se è visibile un messaggio
+		# si sveglia alla sua scadenza per cancellarlo, se il computer sta pensando al frame successivo
+		if turno_ai:
+			eventi = [pygame.event.wait(1000 // 30)]
+		elif current_error():
+			eventi = [pygame.event.wait(max(1, error_expire_time - pygame.time.get_ticks()))]
+		else:
+			eventi = [pygame.event.wait()]
+		eventi += pygame.event.get()
+		if turno_ai:
+			mossa = pensatore.mossa()
+			if mossa is not None:
+				gioca(game, mossa)
+				current_player = not current_player
+		for event in eventi:
 			if event.type == pygame.QUIT:
 				running = False
 				break
-			elif event.type == pygame.MOUSEBUTTONDOWN and not game.fine:
+			elif event.type in ESPOSIZIONE:
+				renderer.invalida()
+			elif event.type == pygame.MOUSEBUTTONDOWN and not game.fine and not turno_ai:
 				x, y = pygame.mouse.get_pos()
 				if not bigMode:
 					col = x // CELL_SIZE
@@ -200,19 +266,59 @@ def gameLoop(bigMode):
 						current_player = not current_player
 					except Exception as e:
 						set_error(f"Mossa non valida: {e}", 2000)
-			elif game.fine and not fine:
-				set_error(f'Il vincitore è {VocGiocatori[game.vincitore]}', duration=5000)
-				fine=True
-
-			# Chiamata unica per disegnare il tabellone e poi sovrapporre l'errore
-			draw_function(screen, game)
-			display_error(screen)
-			pygame.display.update()
-			clock.tick(30)
-		
+			elif event.type == pygame.KEYDOWN and event.key in (pygame.K_u, pygame.K_r):
+				# U annulla l'ultima mossa, R ripete l'ultima mossa annullata;
+				# contro il computer si annulla (o ripete) anche la sua mossa, fino al turno dell'utente
+				if pensatore is not None:
+					pensatore.annulla()
+				try:
+					if event.key == pygame.K_u:
+						game.unmake()
+					else:
+						game.redo()
+					current_player = not current_player
+					fine = False
+					if pensatore is not None and not current_player:
+						if event.key == pygame.K_u:
+							game.unmake()
+							current_player = not current_player
+						elif game.annullate:
+							game.redo()
+							current_player = not current_player
+				except IndexError as e:
+					set_error(str(e), 2000)
+			elif event.type == pygame.KEYDOWN and event.key in (pygame.K_s, pygame.K_l):
+				# S salva la partita in corso, L la riprende dall'ultimo salvataggio
+				try:
+					if event.key == pygame.K_s:
+						with open(SALVATAGGIO, "wb") as f:
+							f.write(codifica(game))
+						set_error("Partita salvata", 1500)
+					else:
+						with open(SALVATAGGIO, "rb") as f:
+							game = decodifica(f.read(), Trissone if bigMode else Tris)
+						if pensatore is not None:
+							pensatore.annulla()
+						current_player = game.mosse % 2 == 0
+						fine = False
+						set_error("Partita ripresa", 1500)
+				except (OSError, ValueError) as e:
+					set_error(f"Salvataggio non disponibile: {e}", 2000)
+
+		if game.fine and not fine:
+			set_error(f'Il vincitore è {game.vincitore}', duration=5000)
+			fine=True
+
+		# Aggiorna sullo schermo solo i rettangoli effettivamente ridisegnati
+		aree = renderer.aggiorna(game)
+		if aree:
+			pygame.display.update(aree)
+		clock.tick(30)
+	if pensatore is not None:
+		pensatore.close()
 
 
-def main():
+def main(avversario=None, tempo=1.0):
 	global big_mode
 	start_screen = True
 
@@ -246,10 +352,14 @@ def main():
 	# Clear dello schermo e inizio gioco
 	screen.fill(WHITE)
 	pygame.display.flip()
-	gameLoop(big_mode)
+	gameLoop(big_mode, avversario, tempo)
 	
 	pygame.quit()
 	sys.exit()
 
 if __name__ == "__main__":
-	main()
+	parser = argparse.ArgumentParser(description='Gioco interattivo: Tris / Trissone')
+	parser.add_argument('-ai', choices=list(GIOCATORI), default=None, help="Giocatore del computer, che muove l'ics (default: due giocatori umani)")
+	parser.add_argument('-tempo', type=float, default=1.0, help='Secondi per mossa del computer')
+	args = parser.parse_args()
+	main(args.ai, args.tempo)
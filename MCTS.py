@@ -0,0 +1,153 @@
+import math
+import time
+import random as rnd
+from Gioco import VocGiocatori
+
+
+class Nodo:
+    '''
+    Nodo dell'albero di ricerca. 'cerchio' indica chi ha giocato la mossa che porta
+    al nodo: 'vittorie' è contato dal suo punto di vista (1 vittoria, 0.5 pareggio).
+    '''
+    __slots__ = ("mossa", "padre", "cerchio", "figli", "da_espandere", "visite", "vittorie")
+
+    def __init__(self, mossa, padre, stato):
+        self.mossa = mossa  # (posGrande, posizione)
+        self.padre = padre
+        self.cerchio = stato.mosse % 2 == 1  # Ha mosso il cerchio se ora tocca all'ics
+        self.figli = []
+        self.da_espandere = stato.legal_moves()
+        self.visite = 0
+        self.vittorie = 0.0
+
+
+def stessa_posizione(a, b):
+    """Vero se due TrissoneBit rappresentano la stessa posizione."""
+    return a.o == b.o and a.x == b.x and a.next == b.next
+
+
+class MCTS:
+    '''
+    Giocatore Monte Carlo Tree Search (selezione UCT, playout casuali) che lavora
+    su TrissoneBit. Il budget è un tempo in secondi e/o un numero di iterazioni.
+    Il sottoalbero della mossa giocata viene riutilizzato alla ricerca successiva:
+    dopo ogni mossa (propria o dell'avversario) chiamare avanza(mossa).
+    Con patte=True i playout usano la modalità patte del TrissoneBit e si fermano appena
+    nessuno può più vincere (il risultato è comunque un pareggio).
+    '''
+    def __init__(self, tempo=0.1, iterazioni=None, c=math.sqrt(2), rng=None, patte=True):
+        self.tempo = tempo
+        self.iterazioni = iterazioni
+        self.c = c
+        self.patte = patte
+        self.rng = rng if rng is not None else rnd.Random()
+        self.radice = None
+        self.stato = None  # Posizione della radice (TrissoneBit)
+
+    def avanza(self, mossa):
+        """Sposta la radice sul figlio corrispondente a 'mossa', conservandone il sottoalbero."""
+        if self.radice is None:
+            return
+        if self.stato.fine:
+            self.radice = self.stato = None
+            return
+        self.stato.add(self.stato.mosse % 2 == 0, mossa[1], mossa[0])
+        if self.stato.fine:
+            # Con patte la posizione della radice può essere conclusa mentre la partita vera
+            # è ancora aperta: la ricerca successiva ricostruisce la radice (e gestisce il caso)
+            self.radice = self.stato = None
+            return
+        for figlio in self.radice.figli:
+            if figlio.mossa == mossa:
+                figlio.padre = None
+                self.radice = figlio
+                return
+        self.radice = Nodo(mossa, None, self.stato)
+
+    def sincronizza(self, stato):
+        """
+        Se 'stato' segue di una mossa la posizione della radice (la risposta dell'avversario),
+        sposta la radice con avanza; altrimenti la ricerca successiva ripartirà da zero.
+        """
+        if self.radice is None or self.stato.fine or self.stato.mosse + 1 != stato.mosse:
+            return
+        for mossa in self.stato.legal_moves():
+            dopo = self.stato.copia()
+            dopo.add(dopo.mosse % 2 == 0, mossa[1], mossa[0])
+            if stessa_posizione(dopo, stato):
+                self.avanza(mossa)
+                return
+
+    def cerca(self, stato, tempo=None, interrompi=None):
+        """
+        Restituisce la mossa (posGrande, posizione) migliore per il giocatore di turno in 'stato'.
+        'tempo' sostituisce, per questa sola ricerca, il budget di tempo del giocatore;
+        'interrompi' (threading.Event) ferma la ricerca alla fine dell'iterazione in corso.
+        """
+        if stato.fine:
+            raise IndexError("Trissone già finito")
+        if self.radice is None or not stessa_posizione(self.stato, stato):
+            self.stato = stato.copia()
+            if self.patte and not self.stato.patte:
+                self.stato.patte = True
+                self.stato.Check()
+            if self.stato.fine:
+                # Nessuno può più vincere: ogni mossa porta al pareggio
+                self.radice = self.stato = None
+                return stato.legal_moves()[0]
+            self.radice = Nodo(None, None, self.stato)
+
+        tempo = self.tempo if tempo is None else tempo
+        scadenza = time.perf_counter() + tempo if tempo is not None else None
+        fatte = 0
+        while True:
+            self._iterazione()
+            fatte += 1
+            if self.iterazioni is not None and fatte >= self.iterazioni:
+                break
+            if scadenza is not None and time.perf_counter() >= scadenza:
+                break
+            if interrompi is not None and interrompi.is_set():
+                break
+        return max(self.radice.figli, key=lambda figlio: figlio.visite).mossa
+
+    def _iterazione(self):
+        rng = self.rng
+        stato = self.stato.copia()
+        nodo = self.radice
+
+        # Selezione: scende con UCT finché il nodo è completamente espanso
+        while not nodo.da_espandere and nodo.figli:
+            log_padre = math.log(nodo.visite)
+            c = self.c
+            nodo = max(nodo.figli, key=lambda f: f.vittorie / f.visite + c * math.sqrt(log_padre / f.visite))
+            stato.add(stato.mosse % 2 == 0, nodo.mossa[1], nodo.mossa[0])
+
+        # Espansione: aggiunge un figlio scelto a caso tra le mosse non ancora provate
+        if nodo.da_espandere:
+            da_espandere = nodo.da_espandere
+            i = rng.randrange(len(da_espandere))
+            da_espandere[i], da_espandere[-1] = da_espandere[-1], da_espandere[i]
+            mossa = da_espandere.pop()
+            stato.add(stato.mosse % 2 == 0, mossa[1], mossa[0])
+            figlio = Nodo(mossa, nodo, stato)
+            nodo.figli.append(figlio)
+            nodo = figlio
+
+        # Playout casuale fino alla fine della partita
+        while not stato.fine:
+            posGrande, posizione = stato.random_legal_move(rng)
+            stato.add(stato.mosse % 2 == 0, posizione, posGrande)
+
+        # Retropropagazione del risultato
+        if stato.vincitore == VocGiocatori[3]:
+            vince_cerchio = None
+        else:
+            vince_cerchio = stato.vincitore == VocGiocatori[1]
+        while nodo is not None:
+            nodo.visite += 1
+            if vince_cerchio is None:
+                nodo.vittorie += 0.5
+            elif nodo.cerchio == vince_cerchio:
+                nodo.vittorie += 1
+            nodo = nodo.padre
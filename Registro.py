@@ -0,0 +1,125 @@
+'''
+Formato binario compatto per registrare partite, pensato per milioni di partite per file.
+
+    intestazione: b"TRSN", versione (1 byte), tipo (1 byte: 0 Trissone, 1 Tris)
+    per ogni partita: numero di mosse n (1 byte), n mosse (1 byte ciascuna), risultato (1 byte)
+
+Una mossa del Trissone è posGrande * 9 + posizione (sempre < 81), una del Tris è la cella.
+Il risultato è la chiave di VocGiocatori (1 cerchio, 2 ics, 3 pareggio).
+Il file si scrive solo in coda, quindi più esecuzioni possono accodare partite allo stesso file.
+'''
+import os
+import mmap
+import struct
+from Gioco import VocGiocatori
+
+
+MAGIC = b"TRSN"
+VERSIONE = 1
+TRISSONE, TRIS = 0, 1
+INTESTAZIONE = struct.Struct("<4sBB")
+
+# Codice del risultato a partire dal vincitore ("cerchio", "ics", "pareggio")
+CodiciRisultato = {nome: codice for codice, nome in VocGiocatori.items()}
+
+
+def codifica_partita(mosse, risultato):
+    """Codifica una partita: 'mosse' sono interi < 81, 'risultato' un codice o il nome del vincitore."""
+    mosse = bytes(mosse)
+    if isinstance(risultato, str):
+        risultato = CodiciRisultato[risultato]
+    return bytes((len(mosse),)) + mosse + bytes((risultato,))
+
+
+def _leggi_intestazione(dati, percorso):
+    if len(dati) < INTESTAZIONE.size:
+        raise ValueError(f"{percorso}: file troppo corto per essere un registro")
+    magic, versione, tipo = INTESTAZIONE.unpack_from(dati)
+    if magic != MAGIC:
+        raise ValueError(f"{percorso}: non è un registro di partite")
+    if versione != VERSIONE:
+        raise ValueError(f"{percorso}: versione {versione} non supportata")
+    return tipo
+
+
+class ScrittoreRegistro:
+    '''
+    Scrittore in streaming: accoda le partite a un file (creandolo con l'intestazione se
+    non esiste) attraverso un buffer, senza tenere le partite in memoria.
+    '''
+    def __init__(self, percorso, tipo=TRISSONE, buffer=1 << 16):
+        self.percorso = percorso
+        if os.path.exists(percorso) and os.path.getsize(percorso) > 0:
+            with open(percorso, "rb") as f:
+                esistente = _leggi_intestazione(f.read(INTESTAZIONE.size), percorso)
+            if esistente != tipo:
+                raise ValueError(f"{percorso}: il registro contiene partite di un altro tipo")
+            self.f = open(percorso, "ab", buffering=buffer)
+        else:
+            self.f = open(percorso, "wb", buffering=buffer)
+            self.f.write(INTESTAZIONE.pack(MAGIC, VERSIONE, tipo))
+
+    def scrivi(self, mosse, risultato):
+        """Accoda una partita."""
+        self.f.write(codifica_partita(mosse, risultato))
+
+    def scrivi_codificate(self, dati):
+        """Accoda partite già codificate con codifica_partita (ad esempio da un altro processo)."""
+        self.f.write(dati)
+
+    def tell(self):
+        """Dimensione del registro scritta finora (buffer compreso)."""
+        return self.f.tell()
+
+    def flush(self, disco=False):
+        """Svuota il buffer; con 'disco' attende anche che i dati siano scritti su disco (fsync)."""
+        self.f.flush()
+        if disco:
+            os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class LettoreRegistro:
+    '''
+    Lettore che mappa il file in memoria (mmap): le partite si leggono una alla volta
+    senza caricare l'intero file. Iterando si ottengono coppie (mosse, risultato),
+    dove mosse è un oggetto bytes.
+    '''
+    def __init__(self, percorso):
+        self.percorso = percorso
+        self.f = open(percorso, "rb")
+        self.dati = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.tipo = _leggi_intestazione(self.dati, percorso)
+
+    def partite(self, offset=INTESTAZIONE.size):
+        """Genera (offset, mosse, risultato) per ogni partita a partire da 'offset'."""
+        dati = self.dati
+        fine = len(dati)
+        while offset < fine:
+            n = dati[offset]
+            if offset + n + 2 > fine:
+                raise ValueError(f"{self.percorso}: partita troncata all'offset {offset}")
+            yield offset, dati[offset + 1:offset + 1 + n], dati[offset + 1 + n]
+            offset += n + 2
+
+    def __iter__(self):
+        for _, mosse, risultato in self.partite():
+            yield mosse, risultato
+
+    def close(self):
+        self.dati.close()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,244 @@
+'''
+Rivedere le partite di un registro (vedi Registro.py), anche di milioni di partite.
+
+Il registro è letto in streaming (mmap) e filtrato (risultato, lunghezza, apertura) senza
+caricarlo in memoria, a partire da un indice o da un offset noto. Per ogni partita Replay
+tiene un keyframe ogni 'passo' mosse (la posizione codificata da Salvataggio, 23 byte), così
+che spostarsi alla mossa N riparte dal keyframe precedente e non dall'inizio della partita.
+
+    python Replay.py partite.bin -risultato ics -min 60       # finestra matplotlib
+    python Replay.py partite.bin -partita 1234567 -testo       # notazione testuale a ogni frame
+
+Tasti della finestra: frecce destra/sinistra una mossa, su/giù 'salto' mosse, Home/Fine inizio
+e fine della partita, n/p partita successiva/precedente, spazio avvio/pausa della riproduzione
+automatica (che avanza di 'salto' mosse a ogni frame, saltando i frame intermedi).
+'''
+import argparse
+import itertools
+from Gioco import Tris, Trissone, VocGiocatori
+from Registro import LettoreRegistro, TRISSONE, CodiciRisultato
+from Salvataggio import codifica, decodifica, notazione
+
+
+class Replay:
+    '''
+    Una partita registrata e la posizione dopo le prime 'posizione' mosse. I keyframe sono
+    creati al caricamento, con una sola passata sulle mosse, così che anche il primo
+    spostamento riparte dal keyframe precedente.
+    '''
+    def __init__(self, mosse, risultato=None, tipo=TRISSONE, passo=8, patte=False):
+        self.mosse = bytes(mosse)
+        self.risultato = risultato
+        self.classe = Trissone if tipo == TRISSONE else Tris
+        self.passo = passo
+        self.patte = patte
+        # Keyframe k: posizione dopo k * passo mosse
+        partita = self._nuova()
+        self.chiavi = [codifica(partita)]
+        for k in range(len(self.mosse)):
+            self._gioca(partita, k)
+            if (k + 1) % passo == 0:
+                self.chiavi.append(codifica(partita))
+        self.partita = self._nuova()
+        self.posizione = 0
+
+    def __len__(self):
+        return len(self.mosse)
+
+    def _nuova(self):
+        return Trissone(self.patte) if self.classe is Trissone else Tris()
+
+    def _gioca(self, partita, k):
+        """Gioca su 'partita' la mossa k-esima della registrazione."""
+        mossa = self.mosse[k]
+        if self.classe is Trissone:
+            posGrande, posizione = divmod(mossa, 9)
+            partita.add(k % 2 == 0, posizione, posGrande)
+        else:
+            partita.add(k % 2 == 0, mossa)
+
+    def vai(self, n):
+        """Porta la partita alla posizione dopo 'n' mosse (limitato alla partita) e la restituisce."""
+        n = max(0, min(n, len(self.mosse)))
+        chiave = n // self.passo
+        if not chiave * self.passo <= self.posizione <= n:
+            self.partita = decodifica(self.chiavi[chiave], self.classe, self.patte) if chiave else self._nuova()
+            self.posizione = chiave * self.passo
+        while self.posizione < n:
+            self._gioca(self.partita, self.posizione)
+            self.posizione += 1
+        return self.partita
+
+    def avanti(self, k=1):
+        return self.vai(self.posizione + k)
+
+    def indietro(self, k=1):
+        return self.vai(self.posizione - k)
+
+
+def filtra(lettore, risultato=None, minimo=0, massimo=81, apertura=None, da=0, offset=None):
+    """
+    Genera (indice, offset, mosse, risultato) delle partite del LettoreRegistro 'lettore' con
+    il 'risultato' dato (1, 2, 3; None qualsiasi), tra 'minimo' e 'massimo' mosse e, se
+    'apertura' non è None, con quella prima mossa. Si parte dalla partita di indice 'da' oppure,
+    se noto, dall'offset di una partita (gli indici sono allora contati da quella partita).
+    """
+    partite = lettore.partite() if offset is None else lettore.partite(offset)
+    for indice, (posizione, mosse, esito) in enumerate(partite):
+        if indice < da:
+            continue
+        if risultato is not None and esito != risultato:
+            continue
+        if not minimo <= len(mosse) <= massimo:
+            continue
+        if apertura is not None and (not mosse or mosse[0] != apertura):
+            continue
+        yield indice, posizione, mosse, esito
+
+
+def _intestazione(voce, replay):
+    indice, offset, _, esito = voce
+    return (f"partita {indice} (offset {offset}): mossa {replay.posizione}/{len(replay)}, "
+            f"esito: {VocGiocatori[esito]}")
+
+
+def mostra_testo(partite, tipo, passo=8, salto=1, patte=False):
+    """Stampa la notazione della posizione ogni 'salto' mosse (e quella finale) per ogni partita."""
+    for voce in partite:
+        replay = Replay(voce[2], voce[3], tipo, passo, patte)
+        while True:
+            print(f"{_intestazione(voce, replay)}  {notazione(replay.partita)}")
+            if replay.posizione == len(replay):
+                break
+            replay.avanti(salto)
+        print()
+
+
+class Visore:
+    '''
+    Finestra matplotlib (viste di Grafica) per scorrere le partite filtrate con la tastiera.
+    Le partite già viste sono tenute in una lista (solo mosse e offset) per tornare indietro.
+    '''
+    def __init__(self, partite, tipo, passo=8, salto=5, pausa=0.2, patte=False):
+        import matplotlib.pyplot as plt
+        from Grafica import VistaTris, VistaTrissone, _vista
+        self.plt = plt
+        self.partite = partite
+        self.tipo = tipo
+        self.passo = passo
+        self.salto = salto
+        self.patte = patte
+        self.viste = []   # (indice, offset, mosse, risultato) delle partite già mostrate
+        self.corrente = -1
+        self.replay = None
+        self.fig = plt.figure(figsize=(8, 8))
+        self.vista = _vista(VistaTrissone if tipo == TRISSONE else VistaTris)
+        self.timer = self.fig.canvas.new_timer(interval=int(pausa * 1000))
+        self.timer.add_callback(self._frame)
+        self.in_riproduzione = False
+        self.fig.canvas.mpl_connect('key_press_event', self._tasto)
+
+    def _partita(self, k):
+        """Passa alla partita k-esima tra quelle viste (leggendo la successiva dal registro se serve)."""
+        if k < 0:
+            return False
+        if k == len(self.viste):
+            voce = next(self.partite, None)
+            if voce is None:
+                return False
+            self.viste.append((voce[0], voce[1], bytes(voce[2]), voce[3]))
+        self.corrente = k
+        voce = self.viste[k]
+        self.replay = Replay(voce[2], voce[3], self.tipo, self.passo, self.patte)
+        return True
+
+    def _disegna(self):
+        partita = self.replay.partita
+        testo = _intestazione(self.viste[self.corrente], self.replay)
+        if self.fig.canvas.manager is not None:
+            self.fig.canvas.manager.set_window_title(testo)
+        if self.tipo == TRISSONE:
+            self.vista.aggiorna(partita, partita.tris)
+        else:
+            self.vista.aggiorna(partita.pos, partita.tris)
+
+    def _frame(self):
+        if self.replay.posizione == len(self.replay):
+            if not self._partita(self.corrente + 1):
+                self.timer.stop()
+                self.in_riproduzione = False
+                return
+        else:
+            self.replay.avanti(self.salto)
+        self._disegna()
+
+    def _tasto(self, event):
+        replay = self.replay
+        if event.key == 'right':
+            replay.avanti()
+        elif event.key == 'left':
+            replay.indietro()
+        elif event.key == 'up':
+            replay.avanti(self.salto)
+        elif event.key == 'down':
+            replay.indietro(self.salto)
+        elif event.key == 'home':
+            replay.vai(0)
+        elif event.key == 'end':
+            replay.vai(len(replay))
+        elif event.key == 'n':
+            self._partita(self.corrente + 1)
+        elif event.key == 'p':
+            self._partita(self.corrente - 1)
+        elif event.key == ' ':
+            self.in_riproduzione = not self.in_riproduzione
+            if self.in_riproduzione:
+                self.timer.start()
+            else:
+                self.timer.stop()
+        else:
+            return
+        self._disegna()
+
+    def mostra(self, mossa=0, riproduci=False):
+        """Apre la finestra sulla prima partita (alla mossa 'mossa'); False se nessuna partita soddisfa i filtri."""
+        if not self._partita(0):
+            return False
+        self.replay.vai(mossa)
+        self._disegna()
+        if riproduci:
+            self.in_riproduzione = True
+            self.timer.start()
+        self.plt.show()
+        return True
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Rivede le partite di un registro (vedi Registro.py)')
+    parser.add_argument('registro', help='File binario delle partite')
+    parser.add_argument('-partita', type=int, default=0, help='Indice della prima partita da considerare')
+    parser.add_argument('-offset', type=int, default=None, help="Offset nel file della prima partita (evita di scorrere le precedenti)")
+    parser.add_argument('-risultato', choices=sorted(CodiciRisultato), default=None, help='Solo le partite con questo esito')
+    parser.add_argument('-min', type=int, default=0, help='Numero minimo di mosse')
+    parser.add_argument('-max', type=int, default=81, help='Numero massimo di mosse')
+    parser.add_argument('-apertura', type=int, default=None, help='Solo le partite con questa prima mossa (posGrande * 9 + posizione)')
+    parser.add_argument('-mossa', type=int, default=0, help='Mossa da cui iniziare a mostrare la prima partita')
+    parser.add_argument('-passo', type=int, default=8, help='Mosse tra due keyframe')
+    parser.add_argument('-salto', type=int, default=5, help='Mosse per frame nel salto rapido e nella riproduzione')
+    parser.add_argument('-pausa', type=float, default=0.2, help='Secondi tra due frame della riproduzione')
+    parser.add_argument('-riproduci', action='store_true', help='Avvia subito la riproduzione automatica')
+    parser.add_argument('-patte', action='store_true', help='Le partite sono state giocate con -patte')
+    parser.add_argument('-testo', action='store_true', help='Stampa la notazione invece di aprire la finestra')
+    parser.add_argument('-quante', type=int, default=None, help='Con -testo, numero massimo di partite da stampare')
+    args = parser.parse_args()
+
+    risultato = CodiciRisultato[args.risultato] if args.risultato else None
+    with LettoreRegistro(args.registro) as lettore:
+        partite = filtra(lettore, risultato, args.min, args.max, args.apertura, args.partita, args.offset)
+        if args.testo:
+            if args.quante is not None:
+                partite = itertools.islice(partite, args.quante)
+            mostra_testo(partite, lettore.tipo, args.passo, args.salto, args.patte)
+        elif not Visore(partite, lettore.tipo, args.passo, args.salto, args.pausa, args.patte).mostra(args.mossa, args.riproduci):
+            print("Nessuna partita soddisfa i filtri")
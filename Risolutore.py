@@ -0,0 +1,138 @@
+import os
+import json
+from Gioco import VocGiocatori
+from Simmetrie import canonico_tris
+from Tabelle import EsitoTris, codice
+
+
+# File in cui viene salvata la tabella di gioco perfetto del tris
+PERCORSO_TABELLA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tris_soluzione.json")
+
+# Tipi di voce della tabella di trasposizione
+ESATTO, INFERIORE, SUPERIORE = 0, 1, 2
+
+
+def chiave(pos):
+    """Chiave della posizione: codice della sua forma canonica (le 8 simmetrie coincidono)."""
+    return codice(canonico_tris(pos)[0])
+
+
+def _di_turno(pos):
+    # Inizia sempre il cerchio: tocca a lui se i due giocatori hanno lo stesso numero di segni
+    return 1 if pos.count(1) == pos.count(2) else 2
+
+
+class Risolutore:
+    '''
+    Negamax con potatura alfa-beta per il tris classico. La tabella di trasposizione
+    è indicizzata sulla forma canonica, quindi le posizioni simmetriche vengono valutate una volta.
+    '''
+    def __init__(self):
+        self.tt = {}
+
+    def negamax(self, pos, alfa=-1, beta=1):
+        """Valore di 'pos' (tupla di 9) per il giocatore di turno: 1 vince, 0 pareggio, -1 perde."""
+        esito = EsitoTris[codice(pos)]
+        if esito == 3:
+            return 0
+        if esito:
+            return -1  # Ha appena vinto l'avversario
+        k = chiave(pos)
+        voce = self.tt.get(k)
+        alfa_iniziale = alfa
+        if voce is not None:
+            valore, tipo = voce
+            if tipo == ESATTO:
+                return valore
+            if tipo == INFERIORE:
+                alfa = max(alfa, valore)
+            else:
+                beta = min(beta, valore)
+            if alfa >= beta:
+                return valore
+
+        giocatore = _di_turno(pos)
+        migliore = -2
+        for cella in range(9):
+            if pos[cella] == 0:
+                figlio = pos[:cella] + (giocatore,) + pos[cella + 1:]
+                valore = -self.negamax(figlio, -beta, -alfa)
+                if valore > migliore:
+                    migliore = valore
+                if valore > alfa:
+                    alfa = valore
+                if alfa >= beta:
+                    break
+
+        if migliore <= alfa_iniziale:
+            tipo = SUPERIORE
+        elif migliore >= beta:
+            tipo = INFERIORE
+        else:
+            tipo = ESATTO
+        self.tt[k] = (migliore, tipo)
+        return migliore
+
+
+def costruisci_tabella():
+    """Valore esatto di ogni posizione raggiungibile, una voce per classe di simmetria."""
+    risolutore = Risolutore()
+    tabella = {}
+    da_visitare = [(0,) * 9]
+    while da_visitare:
+        pos = da_visitare.pop()
+        k = chiave(pos)
+        if k in tabella:
+            continue
+        tabella[k] = risolutore.negamax(pos)
+        if EsitoTris[codice(pos)]:
+            continue
+        giocatore = _di_turno(pos)
+        for cella in range(9):
+            if pos[cella] == 0:
+                da_visitare.append(pos[:cella] + (giocatore,) + pos[cella + 1:])
+    return tabella
+
+
+_tabella = None
+
+def carica_tabella(percorso=PERCORSO_TABELLA):
+    """Carica la tabella di gioco perfetto dal disco; se manca la calcola e la salva."""
+    global _tabella
+    if _tabella is None:
+        if os.path.exists(percorso):
+            with open(percorso) as f:
+                _tabella = {int(k): v for k, v in json.load(f).items()}
+        else:
+            _tabella = costruisci_tabella()
+            with open(percorso, "w") as f:
+                json.dump(_tabella, f)
+    return _tabella
+
+
+def valore(pos):
+    """Valore di una posizione 3x3 per il giocatore di turno (1, 0, -1), in O(1)."""
+    return carica_tabella()[chiave(pos)]
+
+
+def esito(tris):
+    """Esito del Tris con gioco perfetto da entrambe le parti: "cerchio", "ics" o "pareggio"."""
+    if tris.fine:
+        return tris.vincitore
+    pos = tuple(int(v) for v in tris.pos)
+    giocatore = _di_turno(pos)
+    v = valore(pos)
+    if v == 0:
+        return VocGiocatori[3]
+    return VocGiocatori[giocatore if v == 1 else 3 - giocatore]
+
+
+def mossa_migliore(tris):
+    """Cella in cui giocare con gioco perfetto (una consultazione della tabella per cella libera)."""
+    if tris.fine:
+        raise IndexError("Tris già finito")
+    pos = tuple(int(v) for v in tris.pos)
+    giocatore = _di_turno(pos)
+    libere = [cella for cella in range(9) if pos[cella] == 0]
+    # Il valore del figlio è dal punto di vista dell'avversario: si sceglie il minimo
+    return min(libere, key=lambda cella: valore(pos[:cella] + (giocatore,) + pos[cella + 1:]))
@@ -0,0 +1,134 @@
+'''
+Salvataggio compatto di partite in corso (Tris, Trissone e le varianti bitboard).
+
+Formato binario a dimensione fissa (little endian):
+
+    Trissone: 9 codici dei mini board (2 byte ciascuno, codice in base 3 come in Tabelle),
+              stato grande (4 byte: 2 bit di esito per mini board, bit 18-19 esito della partita),
+              next (1 byte, 9 = scelta libera)                                        -> 23 byte
+    Tris:     codice in base 3 (2 byte)                                               ->  2 byte
+
+Notazione testuale per i log: le celle di ogni mini board ("." vuota, "O", "X") separate
+da "/", seguite da uno spazio e dal next ("-" se la scelta è libera), ad esempio
+
+    ........./........./........./........./....O..../........./........./........./......... 4
+
+Per le partite concluse segue un terzo campo con l'esito ("O", "X", "=" pareggio), così che
+anche un pareggio chiuso in anticipo (modalità patte) si ricostruisce come tale.
+
+Decodificando si ottiene esattamente la posizione codificata (pile di annullamento escluse);
+lo stato grande salvato viene confrontato con quello ricalcolato per scartare dati corrotti.
+'''
+import struct
+from Gioco import Tris, Trissone, VocGiocatori
+from Bitboard import TrisBit, TrissoneBit
+from Tabelle import Potenze3, Ternario, EsitoTris, codice
+
+
+TRISSONE = struct.Struct("<9HIB")
+TRIS = struct.Struct("<H")
+
+# Codice del risultato a partire dal vincitore, come in Registro (0: partita in corso)
+_Risultati = {nome: k for k, nome in VocGiocatori.items()}
+_Simboli = ".OX"
+_Esiti = ".OX="  # Indice: codice del risultato
+
+
+def _celle_tris(codice_tris):
+    return [codice_tris // Potenze3[i] % 3 for i in range(9)]
+
+
+def _stato_grande(codici, risultato):
+    stato = 0
+    for i, c in enumerate(codici):
+        stato |= EsitoTris[c] << (2 * i)
+    return stato | risultato << 18
+
+
+def _risultato(partita):
+    return _Risultati[partita.vincitore] if partita.fine else 0
+
+
+def codifica(partita):
+    """Codifica binaria (bytes, dimensione fissa) di un Tris, TrisBit, Trissone o TrissoneBit."""
+    if not hasattr(partita, "next"):
+        return TRIS.pack(partita.codice)
+    if isinstance(partita, TrissoneBit):
+        codici = [Ternario[o] + 2 * Ternario[x] for o, x in zip(partita.o, partita.x)]
+    else:
+        codici = [board.codice for board in partita.pos]
+    return TRISSONE.pack(*codici, _stato_grande(codici, _risultato(partita)), 9 if partita.next is None else partita.next)
+
+
+def _tris(c, classe):
+    if c >= 3 ** 9:
+        raise ValueError(f"Codice di tris non valido: {c}")
+    celle = _celle_tris(c)
+    if classe is Tris:
+        return Tris.da_celle(celle)
+    return TrisBit.da_maschere(sum(1 << i for i in range(9) if celle[i] == 1),
+                               sum(1 << i for i in range(9) if celle[i] == 2))
+
+
+def _trissone(codici, next, classe, patte, stato=None):
+    """Ricostruisce e valida un Trissone; 'stato' è lo stato grande salvato (None: non verificato)."""
+    if any(c >= 3 ** 9 for c in codici) or not 0 <= next <= 9:
+        raise ValueError("Dati del Trissone non validi")
+    next = None if next == 9 else next
+    if next is not None and EsitoTris[codici[next]]:
+        raise ValueError(f"Il mini board {next} è già concluso e non può essere il prossimo")
+    celle = [v for c in codici for v in _celle_tris(c)]
+    partita = classe.da_celle(celle, next, patte)
+    if stato is not None:
+        # Un pareggio salvato da una partita chiusa in anticipo (modalità patte) si ricostruisce come tale
+        if stato >> 18 == 3 and not partita.fine:
+            partita = classe.da_celle(celle, next, True)
+        if stato != _stato_grande(codici, _risultato(partita)):
+            raise ValueError("Lo stato grande salvato non corrisponde alle celle")
+    return partita
+
+
+def decodifica(dati, classe=Trissone, patte=False):
+    """
+    Ricostruisce una partita di tipo 'classe' (Tris, TrisBit, Trissone, TrissoneBit) dai byte
+    prodotti da codifica. Solleva ValueError se i dati non sono una posizione valida.
+    """
+    if classe in (Tris, TrisBit):
+        if len(dati) != TRIS.size:
+            raise ValueError(f"Un tris codificato occupa {TRIS.size} byte, non {len(dati)}")
+        return _tris(TRIS.unpack(dati)[0], classe)
+    if len(dati) != TRISSONE.size:
+        raise ValueError(f"Un Trissone codificato occupa {TRISSONE.size} byte, non {len(dati)}")
+    *codici, stato, next = TRISSONE.unpack(dati)
+    return _trissone(codici, next, classe, patte, stato)
+
+
+def notazione(partita):
+    """Notazione testuale compatta (vedi il docstring del modulo)."""
+    if not hasattr(partita, "next"):
+        return "".join(_Simboli[int(v)] for v in partita.pos)
+    celle = partita.celle()
+    boards = "/".join("".join(_Simboli[celle[i * 9 + k]] for k in range(9)) for i in range(9))
+    testo = f"{boards} {'-' if partita.next is None else partita.next}"
+    return f"{testo} {_Esiti[_risultato(partita)]}" if partita.fine else testo
+
+
+def da_notazione(testo, classe=Trissone, patte=False):
+    """Inverso di notazione: ricostruisce una partita di tipo 'classe'. Solleva ValueError se il testo non è valido."""
+    try:
+        if classe in (Tris, TrisBit):
+            celle = [_Simboli.index(s) for s in testo.strip()]
+            if len(celle) != 9:
+                raise ValueError
+            return _tris(codice(celle), classe)
+        boards, next, *esito = testo.split()
+        boards = boards.split("/")
+        if len(boards) != 9 or any(len(b) != 9 for b in boards) or len(esito) > 1:
+            raise ValueError
+        codici = [codice([_Simboli.index(s) for s in b]) for b in boards]
+        next = 9 if next == "-" else int(next)
+        # Con l'esito lo stato grande si verifica (e un pareggio anticipato si ricostruisce) come in decodifica
+        stato = _stato_grande(codici, _Esiti.index(esito[0], 1)) if esito else None
+    except ValueError:
+        raise ValueError(f"Notazione non valida: {testo!r}") from None
+    return _trissone(codici, next, classe, patte, stato)
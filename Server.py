@@ -0,0 +1,187 @@
+'''
+Server di gioco asyncio: ospita molte partite di Tris e Trissone contemporanee.
+
+Protocollo: una richiesta JSON per riga, una risposta JSON per riga.
+
+    {"cmd": "nuova", "tipo": "trissone" | "tris"}           -> {"ok": true, "id": 1, "stato": {...}}
+    {"cmd": "mossa", "id": 1, "board": 4, "cella": 0}        -> {"ok": true, "stato": {...}}
+    {"cmd": "stato", "id": 1}                                -> {"ok": true, "stato": {...}}
+    {"cmd": "mosse", "id": 1}                                -> {"ok": true, "mosse": [[4, 0], ...]}
+    {"cmd": "chiudi", "id": 1}                               -> {"ok": true}
+
+Per il tris "board" si omette e le mosse sono celle. La mossa è giocata dal giocatore di turno
+(inizia il cerchio) e validata con le regole di add. In caso di errore la risposta è
+{"ok": false, "errore": "..."}. Le partite sono TrisBit / TrissoneBit (poche centinaia di byte
+ciascuna) e quelle inattive da più di 'scadenza' secondi vengono eliminate.
+'''
+import json
+import time
+import asyncio
+import argparse
+from collections import OrderedDict
+from Bitboard import TrisBit, TrissoneBit
+
+
+TIPI = {"trissone": TrissoneBit, "tris": TrisBit}
+
+
+class Sessione:
+    '''Una partita ospitata dal server e l'istante (time.monotonic) dell'ultimo accesso.'''
+    __slots__ = ("gioco", "ultimo")
+
+    def __init__(self, gioco, ultimo):
+        self.gioco = gioco
+        self.ultimo = ultimo
+
+
+def _campo(richiesta, nome):
+    """Campo 'nome' della richiesta; ValueError con il nome del campo se manca."""
+    if nome not in richiesta:
+        raise ValueError(f"Campo mancante nella richiesta: {nome}")
+    return richiesta[nome]
+
+
+def descrivi(gioco):
+    """Stato di una partita in forma serializzabile in JSON."""
+    celle = gioco.celle() if isinstance(gioco, TrissoneBit) else gioco.pos
+    stato = {
+        "celle": "".join(map(str, celle)),
+        "turno": "cerchio" if gioco.mosse % 2 == 0 else "ics",
+        "fine": gioco.fine,
+        "vincitore": gioco.vincitore or None,
+        "tris": gioco.tris,
+    }
+    if isinstance(gioco, TrissoneBit):
+        stato["next"] = gioco.next
+    return stato
+
+
+class ServerTrissone:
+    '''
+    Sessioni del server, in ordine di ultimo accesso (OrderedDict): la pulizia periodica
+    scorre solo le sessioni scadute in testa, senza visitare quelle attive.
+    '''
+    def __init__(self, scadenza=600.0, pulizia=None):
+        self.scadenza = scadenza
+        self.pulizia = pulizia if pulizia is not None else min(60.0, scadenza / 2)
+        self.sessioni = OrderedDict()
+        self.prossimo_id = 1
+        self.scadute = 0
+
+    def _sessione(self, richiesta):
+        sessione = self.sessioni.get(richiesta.get("id"))
+        if sessione is None:
+            raise KeyError(f"Partita {richiesta.get('id')} inesistente o scaduta")
+        sessione.ultimo = time.monotonic()
+        self.sessioni.move_to_end(richiesta["id"])
+        return sessione
+
+    def gestisci(self, richiesta):
+        """Esegue una richiesta (dizionario) e restituisce la risposta (dizionario)."""
+        try:
+            cmd = richiesta.get("cmd")
+            if cmd == "nuova":
+                tipo = richiesta.get("tipo", "trissone")
+                if tipo not in TIPI:
+                    raise ValueError(f"Tipo non valido: {tipo} (ammessi: {', '.join(TIPI)})")
+                id = self.prossimo_id
+                self.prossimo_id += 1
+                self.sessioni[id] = Sessione(TIPI[tipo](), time.monotonic())
+                return {"ok": True, "id": id, "stato": descrivi(self.sessioni[id].gioco)}
+            if cmd == "mossa":
+                gioco = self._sessione(richiesta).gioco
+                cella = int(_campo(richiesta, "cella"))
+                if isinstance(gioco, TrissoneBit):
+                    gioco.add(gioco.mosse % 2 == 0, cella, int(_campo(richiesta, "board")))
+                else:
+                    gioco.add(gioco.mosse % 2 == 0, cella)
+                return {"ok": True, "stato": descrivi(gioco)}
+            if cmd == "stato":
+                return {"ok": True, "stato": descrivi(self._sessione(richiesta).gioco)}
+            if cmd == "mosse":
+                return {"ok": True, "mosse": self._sessione(richiesta).gioco.legal_moves()}
+            if cmd == "chiudi":
+                self._sessione(richiesta)
+                del self.sessioni[richiesta["id"]]
+                return {"ok": True}
+            raise ValueError(f"Comando non valido: {cmd}")
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            messaggio = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            return {"ok": False, "errore": messaggio}
+
+    def elimina_scadute(self, adesso=None):
+        """Elimina le sessioni inattive da più di 'scadenza' secondi; restituisce quante."""
+        limite = (time.monotonic() if adesso is None else adesso) - self.scadenza
+        eliminate = 0
+        sessioni = self.sessioni
+        while sessioni:
+            id, sessione = next(iter(sessioni.items()))
+            if sessione.ultimo > limite:
+                break
+            del sessioni[id]
+            eliminate += 1
+        self.scadute += eliminate
+        return eliminate
+
+    async def connessione(self, reader, writer):
+        """Gestisce un client: legge righe JSON e risponde a ciascuna, finché il client chiude."""
+        try:
+            while True:
+                try:
+                    riga = await reader.readline()
+                except ValueError:
+                    # Riga oltre il limite dello stream: errore di protocollo, la connessione si chiude
+                    writer.write(json.dumps({"ok": False, "errore": "Richiesta troppo lunga"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not riga:
+                    break
+                if not riga.strip():
+                    continue
+                try:
+                    richiesta = json.loads(riga)
+                    if not isinstance(richiesta, dict):
+                        raise ValueError("La richiesta deve essere un oggetto JSON")
+                except ValueError as e:
+                    risposta = {"ok": False, "errore": f"JSON non valido: {e}"}
+                else:
+                    risposta = self.gestisci(richiesta)
+                writer.write(json.dumps(risposta).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def _pulizia_periodica(self):
+        while True:
+            await asyncio.sleep(self.pulizia)
+            self.elimina_scadute()
+
+    async def servi(self, host="127.0.0.1", porta=8765, socket=None):
+        """Avvia il server (TCP locale o socket Unix) e serve i client finché non viene interrotto."""
+        if socket is not None:
+            server = await asyncio.start_unix_server(self.connessione, socket)
+        else:
+            server = await asyncio.start_server(self.connessione, host, porta)
+        pulizia = asyncio.create_task(self._pulizia_periodica())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            pulizia.cancel()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Server di partite di Tris / Trissone (JSON su righe)')
+    parser.add_argument('-host', default='127.0.0.1', help='Indirizzo su cui ascoltare')
+    parser.add_argument('-porta', type=int, default=8765, help='Porta TCP')
+    parser.add_argument('-socket', default=None, help='Socket Unix da usare al posto della porta TCP')
+    parser.add_argument('-scadenza', type=float, default=600, help='Secondi di inattività dopo cui una partita viene eliminata')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(ServerTrissone(args.scadenza).servi(args.host, args.porta, args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,118 @@
+'''
+Simmetrie della griglia 3x3 (le stesse di PosizioniVincenti): 4 rotazioni e 4 riflessioni.
+Per il Trissone la stessa trasformazione si applica insieme ai mini board, alle celle di ogni
+mini board e al vincolo next. Le forme canoniche permettono a cache, libri delle aperture e
+statistiche di salvare una sola voce per classe di simmetria; le mosse calcolate sulla forma
+canonica si riportano alla posizione originale con mossa_originale / cella_originale.
+'''
+
+
+def _ruota(cella):
+    # Rotazione di 90° in senso orario: (riga, colonna) -> (colonna, 2 - riga)
+    riga, colonna = divmod(cella, 3)
+    return colonna * 3 + (2 - riga)
+
+
+def _rifletti(cella):
+    # Riflessione rispetto all'asse verticale: (riga, colonna) -> (riga, 2 - colonna)
+    riga, colonna = divmod(cella, 3)
+    return riga * 3 + (2 - colonna)
+
+
+def _costruisci():
+    simmetrie = []
+    base = list(range(9))
+    for riflessa in (False, True):
+        perm = [_rifletti(c) for c in base] if riflessa else base[:]
+        for _ in range(4):
+            simmetrie.append(tuple(perm))
+            perm = [_ruota(c) for c in perm]
+    return simmetrie
+
+
+# SIMMETRIE[t][i]: cella in cui finisce la cella i applicando la trasformazione t (t = 0 è l'identità)
+SIMMETRIE = _costruisci()
+
+# INVERSE[t]: trasformazione che annulla t
+INVERSE = [next(u for u in range(8) if all(SIMMETRIE[u][SIMMETRIE[t][i]] == i for i in range(9))) for t in range(8)]
+
+
+def trasforma(pos, t):
+    """Applica la trasformazione 't' a una posizione 3x3 (sequenza di 9 valori)."""
+    perm = SIMMETRIE[t]
+    nuova = [0] * 9
+    for i in range(9):
+        nuova[perm[i]] = pos[i]
+    return tuple(nuova)
+
+
+def canonico_tris(pos):
+    """
+    Restituisce (posizione canonica, trasformazione) di una posizione 3x3:
+    la forma canonica è la minima (come tupla) tra le 8 trasformate.
+    """
+    pos = tuple(int(v) for v in pos)
+    return min((trasforma(pos, t), t) for t in range(8))
+
+
+# Per il Trissone la stessa trasformazione si applica sia ai mini board sia alle celle:
+# SIMMETRIE_TRISSONE[t][board * 9 + cella] = indice (0-80) in cui finisce la cella
+SIMMETRIE_TRISSONE = [tuple(perm[k // 9] * 9 + perm[k % 9] for k in range(81)) for perm in SIMMETRIE]
+
+
+def trasforma_trissone(celle, next, t):
+    """Applica la trasformazione 't' a un Trissone dato come 81 celle (board * 9 + cella) e next."""
+    perm = SIMMETRIE_TRISSONE[t]
+    nuova = [0] * 81
+    for k in range(81):
+        nuova[perm[k]] = celle[k]
+    return tuple(nuova), (None if next is None else SIMMETRIE[t][next])
+
+
+def canonico_trissone(celle, next):
+    """
+    Restituisce (celle canoniche, next canonico, trasformazione) di un Trissone:
+    la forma canonica è la minima tra le 8 trasformate (next None conta come 9).
+    """
+    celle = tuple(int(v) for v in celle)
+    migliore = None
+    for t in range(8):
+        nuova, nuovo_next = trasforma_trissone(celle, next, t)
+        candidato = (nuova, 9 if nuovo_next is None else nuovo_next, t)
+        if migliore is None or candidato < migliore:
+            migliore = candidato
+    nuova, nuovo_next, t = migliore
+    return nuova, (None if nuovo_next == 9 else nuovo_next), t
+
+
+def cella_canonica(cella, t):
+    """Cella (0-8) corrispondente a 'cella' dopo la trasformazione 't'."""
+    return SIMMETRIE[t][cella]
+
+
+def cella_originale(cella, t):
+    """Cella della posizione originale corrispondente a 'cella' della forma canonica ottenuta con 't'."""
+    return SIMMETRIE[INVERSE[t]][cella]
+
+
+def mossa_canonica(mossa, t):
+    """Mossa (posGrande, posizione) corrispondente a 'mossa' dopo la trasformazione 't'."""
+    perm = SIMMETRIE[t]
+    return perm[mossa[0]], perm[mossa[1]]
+
+
+def mossa_originale(mossa, t):
+    """Mossa (posGrande, posizione) della posizione originale corrispondente a 'mossa' della forma canonica."""
+    return mossa_canonica(mossa, INVERSE[t])
+
+
+def canonico(partita):
+    """
+    Forma canonica di una partita e trasformazione che la produce:
+      - Tris / TrisBit: ((9 celle), t)
+      - Trissone / TrissoneBit: (((81 celle), next), t)
+    """
+    if hasattr(partita, "celle"):
+        celle, next, t = canonico_trissone(partita.celle(), partita.next)
+        return (celle, next), t
+    return canonico_tris(partita.pos)
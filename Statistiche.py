@@ -0,0 +1,144 @@
+'''
+Statistiche in streaming delle partite di Trissone, in memoria costante.
+
+Ogni partita è data come sequenza di mosse (posGrande * 9 + posizione, come in Registro)
+e risultato (1 cerchio, 2 ics, 3 pareggio). Si raccolgono:
+  - esiti per lunghezza della partita (da cui istogramma delle lunghezze e vantaggio di chi inizia)
+  - esiti per cella e per mini board della prima mossa
+  - quante volte ogni mini board decide la partita (il mini board dell'ultima mossa di una vittoria)
+Due aggregatori si possono unire (unisci), quindi ogni blocco o processo può avere il proprio.
+'''
+import json
+import argparse
+from Gioco import VocGiocatori
+
+
+class Statistiche:
+    '''Aggregatore: contatori di dimensione fissa, aggiornati in O(1) per partita.'''
+    def __init__(self):
+        self.esiti = [0, 0, 0, 0]  # Indice: codice del risultato (0 non usato)
+        self.per_lunghezza = [[0, 0, 0, 0] for _ in range(82)]
+        self.per_cella = [[0, 0, 0, 0] for _ in range(9)]   # Cella della prima mossa
+        self.per_board = [[0, 0, 0, 0] for _ in range(9)]   # Mini board della prima mossa
+        self.decisivo = [[0, 0, 0] for _ in range(9)]       # Vittorie (cerchio, ics) chiuse in ogni mini board
+        self.andamento = []  # (partite, vantaggio del cerchio) a ogni istantanea
+
+    @property
+    def partite(self):
+        return self.esiti[1] + self.esiti[2] + self.esiti[3]
+
+    def aggiungi(self, mosse, risultato):
+        """Aggiunge una partita: 'mosse' sono interi posGrande * 9 + posizione, 'risultato' 1, 2 o 3."""
+        self.esiti[risultato] += 1
+        self.per_lunghezza[len(mosse)][risultato] += 1
+        if mosse:
+            posGrande, posizione = divmod(mosse[0], 9)
+            self.per_cella[posizione][risultato] += 1
+            self.per_board[posGrande][risultato] += 1
+            if risultato != 3:
+                self.decisivo[mosse[-1] // 9][risultato] += 1
+
+    def aggiungi_partita(self, partita):
+        """Aggiunge un Trissone concluso (le mosse sono lette con mosse_giocate)."""
+        risultato = 1 if partita.vincitore == VocGiocatori[1] else 2 if partita.vincitore == VocGiocatori[2] else 3
+        self.aggiungi(partita.mosse_giocate(), risultato)
+
+    def unisci(self, altra):
+        """Somma i contatori di un altro aggregatore (l'andamento resta quello di self)."""
+        for mio, suo in ((self.per_lunghezza, altra.per_lunghezza), (self.per_cella, altra.per_cella),
+                         (self.per_board, altra.per_board), (self.decisivo, altra.decisivo)):
+            for riga, riga_altra in zip(mio, suo):
+                for k, v in enumerate(riga_altra):
+                    riga[k] += v
+        for k, v in enumerate(altra.esiti):
+            self.esiti[k] += v
+        return self
+
+    def vantaggio(self):
+        """Vantaggio di chi inizia (il cerchio): (vittorie cerchio - vittorie ics) / partite."""
+        n = self.partite
+        return (self.esiti[1] - self.esiti[2]) / n if n else 0.0
+
+    def lunghezza_media(self):
+        n = self.partite
+        return sum(k * sum(riga) for k, riga in enumerate(self.per_lunghezza)) / n if n else 0.0
+
+    def istantanea(self):
+        """Registra il punto corrente dell'andamento e restituisce una riga di riepilogo."""
+        n = self.partite
+        self.andamento.append((n, self.vantaggio()))
+        if not n:
+            return "partite: 0"
+        return (f"partite: {n}  cerchio: {self.esiti[1] / n:.3f}  ics: {self.esiti[2] / n:.3f}  "
+                f"pareggi: {self.esiti[3] / n:.3f}  vantaggio: {self.vantaggio():+.3f}  "
+                f"mosse medie: {self.lunghezza_media():.1f}")
+
+    def stato(self):
+        """Contatori grezzi, serializzabili in JSON (vedi da_stato)."""
+        return {
+            "esiti": self.esiti,
+            "per_lunghezza": self.per_lunghezza,
+            "per_cella": self.per_cella,
+            "per_board": self.per_board,
+            "decisivo": self.decisivo,
+            "andamento": self.andamento,
+        }
+
+    @classmethod
+    def da_stato(cls, stato):
+        """Ricostruisce un aggregatore dai contatori restituiti da stato()."""
+        s = cls()
+        s.esiti = list(stato["esiti"])
+        s.per_lunghezza = [list(r) for r in stato["per_lunghezza"]]
+        s.per_cella = [list(r) for r in stato["per_cella"]]
+        s.per_board = [list(r) for r in stato["per_board"]]
+        s.decisivo = [list(r) for r in stato["decisivo"]]
+        s.andamento = [tuple(p) for p in stato["andamento"]]
+        return s
+
+    def riassunto(self):
+        """Statistiche derivate (percentuali, istogramma) in un dizionario serializzabile in JSON."""
+        def tassi(riga):
+            n = riga[1] + riga[2] + riga[3]
+            return {"partite": n,
+                    "cerchio": riga[1] / n if n else 0.0,
+                    "ics": riga[2] / n if n else 0.0,
+                    "pareggi": riga[3] / n if n else 0.0}
+
+        vittorie = self.esiti[1] + self.esiti[2]
+        return {
+            "totale": tassi(self.esiti),
+            "vantaggio_cerchio": self.vantaggio(),
+            "mosse_medie": self.lunghezza_media(),
+            "lunghezze": {k: tassi(riga) for k, riga in enumerate(self.per_lunghezza) if sum(riga)},
+            "prima_cella": [tassi(riga) for riga in self.per_cella],
+            "primo_board": [tassi(riga) for riga in self.per_board],
+            "board_decisivo": [(riga[1] + riga[2]) / vittorie if vittorie else 0.0 for riga in self.decisivo],
+            "andamento": self.andamento,
+        }
+
+    def salva(self, percorso):
+        """Scrive riassunto e contatori grezzi in un file JSON."""
+        with open(percorso, "w") as f:
+            json.dump({"riassunto": self.riassunto(), "contatori": self.stato()}, f, indent=2)
+
+
+if __name__ == "__main__":
+
+    # Statistiche a posteriori da un registro di partite (vedi Registro.py)
+    from Registro import LettoreRegistro, TRISSONE
+
+    parser = argparse.ArgumentParser(description='Statistiche delle partite di un registro')
+    parser.add_argument('registro', help='File binario delle partite (vedi Registro.py)')
+    parser.add_argument('-o', default=None, help='File JSON del riassunto (default: solo a video)')
+    args = parser.parse_args()
+
+    statistiche = Statistiche()
+    with LettoreRegistro(args.registro) as lettore:
+        if lettore.tipo != TRISSONE:
+            raise SystemExit(f"{args.registro}: il registro non contiene partite di Trissone")
+        for mosse, risultato in lettore:
+            statistiche.aggiungi(mosse, risultato)
+    print(statistiche.istantanea())
+    if args.o:
+        statistiche.salva(args.o)
@@ -0,0 +1,78 @@
+'''
+Tabelle precalcolate per i mini board (3^9 = 19683 riempimenti possibili), costruite all'import.
+Un mini board è codificato in base 3: codice = somma di pos[i] * 3**i (0 vuota, 1 O, 2 X).
+
+    EsitoTris[codice]       0 in corso, 1 vinto dal cerchio, 2 vinto dall'ics, 3 pareggio
+    LineaTris[codice]       indice in PosizioniVincenti della linea vincente, -1 se nessuna
+    MinacceCerchio[codice]  maschera a 9 bit delle celle libere con cui il cerchio vincerebbe subito
+    MinacceIcs[codice]      idem per l'ics
+    VincibileTris[codice]   bit 1: il cerchio può ancora completare una linea, bit 2: l'ics
+
+Le tabelle di minacce e vincibilità valgono 0 per i mini board già conclusi.
+Per le maschere a 9 bit (bit i = cella i, oppure mini board i del Trissone):
+
+    LineaVincente[maschera] indice della prima combinazione vincente contenuta, -1 se nessuna
+'''
+import numpy as np
+
+
+# Combinazioni vincenti (per mini board e per il Trissone)
+PosizioniVincenti = [
+    [0, 1, 2],
+    [3, 4, 5],
+    [6, 7, 8],
+    [0, 3, 6],
+    [1, 4, 7],
+    [2, 5, 8],
+    [0, 4, 8],
+    [2, 4, 6],
+]
+
+# Maschere a 9 bit delle combinazioni vincenti (il bit i corrisponde alla cella i)
+MaschereVincenti = [(1 << a) | (1 << b) | (1 << c) for a, b, c in PosizioniVincenti]
+
+LineaVincente = [next((i for i, linea in enumerate(MaschereVincenti) if maschera & linea == linea), -1)
+                 for maschera in range(512)]
+
+# Potenze3[i] = 3**i, per aggiornare il codice di un mini board dopo una mossa
+Potenze3 = [3 ** i for i in range(9)]
+
+# Ternario[maschera]: codice in base 3 con cifra 1 nelle celle della maschera a 9 bit
+# (codice di un TrisBit: Ternario[o] + 2 * Ternario[x])
+Ternario = [sum(Potenze3[i] for i in range(9) if maschera >> i & 1) for maschera in range(512)]
+
+
+
+def codice(pos):
+    """Codice in base 3 di un mini board (sequenza di 9 valori 0, 1, 2)."""
+    c = 0
+    for v in reversed(pos):
+        c = c * 3 + int(v)
+    return c
+
+
+def _costruisci():
+    # Tutti i 19683 riempimenti insieme, con NumPy; le tabelle restano liste (più veloci da indicizzare)
+    indici = np.array(PosizioniVincenti)
+    cifre = np.arange(19683)[:, None] // np.array(Potenze3) % 3   # (19683, 9)
+    linee = cifre[:, indici]                                         # (19683, 8, 3)
+    piene = (linee[:, :, 0] == linee[:, :, 1]) & (linee[:, :, 1] == linee[:, :, 2]) & (linee[:, :, 0] != 0)
+    vinto = piene.any(axis=1)
+    prima = piene.argmax(axis=1)  # Con più linee complete vale la prima
+    righe = np.arange(19683)
+    esito = np.where(vinto, linee[righe, prima, 0], np.where((cifre != 0).all(axis=1), 3, 0))
+    aperto = esito == 0
+    # Cella libera di ogni linea con due simboli uguali (se ce n'è una)
+    vuota = np.take_along_axis(np.broadcast_to(indici, linee.shape), (linee == 0).argmax(axis=2)[:, :, None], 2)[:, :, 0]
+    minacce = []
+    vincibile = np.zeros(19683, dtype=np.int64)
+    for giocatore in (1, 2):
+        libera = ~(linee == 3 - giocatore).any(axis=2) & aperto[:, None]
+        vincibile |= np.where(libera.any(axis=1), giocatore, 0)
+        doppie = libera & ((linee == giocatore).sum(axis=2) == 2)
+        minacce.append(np.bitwise_or.reduce(np.where(doppie, 1 << vuota, 0), axis=1))
+    return (esito.tolist(), np.where(vinto, prima, -1).tolist(),
+            minacce[0].tolist(), minacce[1].tolist(), vincibile.tolist())
+
+
+EsitoTris, LineaTris, MinacceCerchio, MinacceIcs, VincibileTris = _costruisci()
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+
+
+class TabellaTrasposizioni:
+    '''
+    Cache limitata di posizioni già valutate, indicizzata sull'hash di Zobrist
+    (Tris.hash, Trissone.hash), da condividere tra AI e codice di analisi.
+    Politiche di sostituzione:
+      - "lru": quando la tabella è piena scarta la voce usata meno di recente;
+      - "profondita": tabella a indirizzamento diretto (uno slot per chiave % capienza),
+        una voce viene sostituita solo da una valutazione almeno altrettanto profonda.
+    '''
+    POLITICHE = ("lru", "profondita")
+
+    def __init__(self, capienza=1 << 20, politica="lru"):
+        if politica not in self.POLITICHE:
+            raise ValueError(f"Politica non valida: {politica} (ammesse: {', '.join(self.POLITICHE)})")
+        if capienza <= 0:
+            raise ValueError("La capienza deve essere positiva")
+        self.capienza = capienza
+        self.politica = politica
+        self.colpi = 0
+        self.mancati = 0
+        self.clear()
+
+    def clear(self):
+        if self.politica == "lru":
+            self._voci = OrderedDict()
+        else:
+            self._chiavi = [None] * self.capienza
+            self._profondita = [0] * self.capienza
+            self._valori = [None] * self.capienza
+            self._occupati = 0
+
+    def __len__(self):
+        return len(self._voci) if self.politica == "lru" else self._occupati
+
+    def __contains__(self, chiave):
+        if self.politica == "lru":
+            return chiave in self._voci
+        return self._chiavi[chiave % self.capienza] == chiave
+
+    def get(self, chiave, default=None):
+        """Valore salvato per 'chiave', oppure 'default' se assente."""
+        if self.politica == "lru":
+            voce = self._voci.get(chiave)
+            if voce is None:
+                self.mancati += 1
+                return default
+            self._voci.move_to_end(chiave)
+            self.colpi += 1
+            return voce[1]
+        slot = chiave % self.capienza
+        if self._chiavi[slot] != chiave:
+            self.mancati += 1
+            return default
+        self.colpi += 1
+        return self._valori[slot]
+
+    def profondita(self, chiave):
+        """Profondità con cui è stata salvata 'chiave' (-1 se assente)."""
+        if self.politica == "lru":
+            voce = self._voci.get(chiave)
+            return -1 if voce is None else voce[0]
+        slot = chiave % self.capienza
+        return self._profondita[slot] if self._chiavi[slot] == chiave else -1
+
+    def put(self, chiave, valore, profondita=0):
+        """Salva 'valore' per 'chiave', secondo la politica di sostituzione."""
+        if self.politica == "lru":
+            voci = self._voci
+            if chiave in voci:
+                voci.move_to_end(chiave)
+            elif len(voci) >= self.capienza:
+                voci.popitem(last=False)
+            voci[chiave] = (profondita, valore)
+            return
+        slot = chiave % self.capienza
+        presente = self._chiavi[slot]
+        if presente is None:
+            self._occupati += 1
+        elif presente != chiave and self._profondita[slot] > profondita:
+            return  # Lo slot contiene una valutazione più profonda: la si conserva
+        self._chiavi[slot] = chiave
+        self._profondita[slot] = profondita
+        self._valori[slot] = valore
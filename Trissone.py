@@ -1,247 +1,36 @@
-import numpy as np
+import os
+import json
+import time
 import argparse
 import random as rnd
-import matplotlib.pyplot as plt
-import Utility as U
+from concurrent.futures import ProcessPoolExecutor
+from Giocatori import GIOCATORI, GiocatoreCasuale, crea_giocatore
+# Il motore di gioco è in Gioco (nessuna libreria grafica); i nomi restano importabili da Trissone
+from Gioco import (PosizioniVincenti, LineePerCella, VocGiocatori, ZobristTris, ZobristCelle, ZobristNext,
+                   Tris, Trissone)
 
+# Numero di partite per blocco nella simulazione (ogni blocco ha il proprio generatore casuale)
+BLOCCO = 1000
 
-# Combinazioni vincenti (per mini board e per il Trissone)
-PosizioniVincenti = [
-    [0, 1, 2],
-    [3, 4, 5],
-    [6, 7, 8],
-    [0, 3, 6],
-    [1, 4, 7],
-    [2, 5, 8],
-    [0, 4, 8],
-    [2, 4, 6],
-]
+# Nomi della grafica, importati da Grafica (e quindi matplotlib) solo al primo accesso
+_GRAFICA = ("SIMBOLI", "VistaTris", "VistaTrissone", "draw_board", "draw_big_board")
 
-# Vocabolario dei giocatori
-VocGiocatori = {1: "cerchio", 2: "ics", 3: "pareggio"}
 
+def __getattr__(nome):
+    if nome in _GRAFICA:
+        import Grafica
+        return getattr(Grafica, nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
 
-
-def draw_board(pos, winning_positions=None, showtime=0):
-    """
-    Disegna graficamente il tris:
-      - pos: array 1D di 9 elementi (0: vuota, 1: O, 2: X)
-      - winning_positions: se non None, evidenzia le celle vincenti e mostra il tris vincente
-    """
-    plt.clf()
-    # Disegna simboli e griglia
-    for i in range(3):
-        for j in range(3):
-            idx = i * 3 + j
-            if pos[idx] == 1:
-                simbolo = "O"
-            elif pos[idx] == 2:
-                simbolo = "X"
-            else:
-                simbolo = ""
-            # Posizionamento: le righe vengono visualizzate dall'alto verso il basso
-            plt.text(j + 0.5, 2.5 - i, simbolo, fontsize=40, ha='center', va='center')
-    # Disegna le linee della griglia
-    plt.plot([1, 1], [0, 3], color='black', linewidth=2)
-    plt.plot([2, 2], [0, 3], color='black', linewidth=2)
-    plt.plot([0, 3], [1, 1], color='black', linewidth=2)
-    plt.plot([0, 3], [2, 2], color='black', linewidth=2)
-    plt.xlim(0, 3)
-    plt.ylim(0, 3)
-    plt.axis('off')
-    # Se la partita è finita e c'è un tris vincente, evidenzia le celle
-    if winning_positions is not None:
-        for idx in winning_positions:
-            i = idx // 3
-            j = idx % 3
-            rect = plt.Rectangle((j, 2 - i), 1, 1, fill=False, edgecolor='red', linewidth=3)
-            plt.gca().add_patch(rect)
-        # Aggiunge una riga di testo sotto la griglia
-        plt.figtext(0.5, 0.01, f"Tris vincente: {winning_positions}", ha="center", fontsize=16, color='red')
-    plt.draw()
-    plt.pause(showtime)
-
-def draw_big_board(trissone, winning_positions_big=None, showtime=0):
-    """
-    Disegna graficamente il Trissone (Ultimate Tic Tac Toe).
-      - trissone: istanza della classe Trissone
-      - winning_positions_big: se non None, evidenzia (con rettangoli blu) i mini board vincenti e mostra il tris vincente
-    """
-    plt.clf()
-    # L'intero tabellone è formato da una griglia 9x9 (ogni mini board è 3x3)
-    # Disegna linee sottili (griglia interna di ogni mini board)
-    for x in range(10):
-        plt.plot([x, x], [0, 9], color='gray', linewidth=1)
-    for y in range(10):
-        plt.plot([0, 9], [y, y], color='gray', linewidth=1)
-    # Disegna linee spesse per delimitare i 9 mini board
-    for x in [0, 3, 6, 9]:
-        plt.plot([x, x], [0, 9], color='black', linewidth=3)
-    for y in [0, 3, 6, 9]:
-        plt.plot([0, 9], [y, y], color='black', linewidth=3)
-    
-    # Disegna i simboli per ciascun mini board
-    for big_idx, mini_board in enumerate(trissone.pos):
-        big_row = big_idx // 3
-        big_col = big_idx % 3
-        # Calcola l'offset per il mini board corrente
-        x_offset = big_col * 3
-        y_offset = (2 - big_row) * 3  # in modo che la riga 0 appaia in alto
-        for i in range(3):
-            for j in range(3):
-                mini_idx = i * 3 + j
-                val = mini_board.pos[mini_idx]
-                if val == 1:
-                    simbolo = "O"
-                elif val == 2:
-                    simbolo = "X"
-                else:
-                    simbolo = ""
-                # Coordinate all'interno del mini board
-                x_coord = x_offset + j + 0.5
-                y_coord = y_offset + (2.5 - i)
-                plt.text(x_coord, y_coord, simbolo, fontsize=20, ha='center', va='center')
-        # Se il mini board ha un tris vincente, evidenzia la combinazione (con rettangoli rossi)
-        if mini_board.tris is not None:
-            for idx in mini_board.tris:
-                i = idx // 3
-                j = idx % 3
-                x_rect = x_offset + j
-                y_rect = y_offset + (2 - i)
-                rect = plt.Rectangle((x_rect, y_rect), 1, 1, fill=False, edgecolor='red', linewidth=2)
-                plt.gca().add_patch(rect)
-    
-    # Se il Trissone è concluso con un tris a livello "grande", evidenzia i mini board vincenti
-    if winning_positions_big is not None:
-        for idx in winning_positions_big:
-            big_row = idx // 3
-            big_col = idx % 3
-            x_offset = big_col * 3
-            y_offset = (2 - big_row) * 3
-            rect = plt.Rectangle((x_offset, y_offset), 3, 3, fill=False, edgecolor='blue', linewidth=3)
-            plt.gca().add_patch(rect)
-        plt.figtext(0.5, 0.01, f"Tris vincente nel Trissone: {winning_positions_big}", ha="center", fontsize=16, color='blue')
-    
-    plt.xlim(0, 9)
-    plt.ylim(0, 9)
-    plt.axis('off')
-    plt.draw()
-    plt.pause(showtime)
-
-class Tris:
-    '''
-    Classe che definisce una partita di tris (mini board).
-    Per convenzione, inizia sempre il cerchio.
-    '''
-    def __init__(self):
-        self.pos = np.zeros(9, dtype=int)
-        self.fine = False
-        self.vincitore = 0
-        self.tris = None  # Salva la combinazione vincente se presente
-
-    def Check(self):
-        if not self.fine:
-            vinto = False
-            for item in PosizioniVincenti:
-                if self.pos[item[0]] == self.pos[item[1]] == self.pos[item[2]] != 0:
-                    self.fine = True
-                    self.vincitore = VocGiocatori[self.pos[item[0]]]
-                    self.tris = item
-                    vinto = True
-                    break
-            if (not vinto) and (0 not in self.pos):
-                self.fine = True
-                self.vincitore = VocGiocatori[3]
-
-    def add(self, cerchio: bool, posizione: int):
-        if posizione < 0 or posizione > 8:
-            raise IndexError("Posizione non valida")
-        if self.fine:
-            raise IndexError("Tris già finito")
-        if self.pos[posizione] != 0:
-            raise IndexError("Posizione non valida")
-        self.pos[posizione] = 1 if cerchio else 2
-        self.Check()
-
-class Trissone:
-    '''
-    Classe che definisce il Trissone (Ultimate Tic Tac Toe),
-    composto da 9 mini board (Tris).
-    '''
-    def __init__(self):
-        # Inizializza 9 mini board
-        self.pos = np.array([Tris() for _ in range(9)])
-        self.fine = False
-        self.vincitore = 0
-        self.next = None  # Indica l'indice del mini board in cui dovrà essere giocata la prossima mossa
-        self.tris = None  # Salva la combinazione vincente a livello di Trissone
-
-    def Check(self):
-        # Aggiorna lo stato di ogni mini board
-        for piccolo in self.pos:
-            piccolo.Check()
-        # Creiamo un array "stato" per i mini board: 0 se non concluso, 1 o 2 se vinto
-        stato = np.zeros(9, dtype=int)
-        for i, board in enumerate(self.pos):
-            if board.vincitore == VocGiocatori[1]:
-                stato[i] = 1
-            elif board.vincitore == VocGiocatori[2]:
-                stato[i] = 2
-        # in caso di pareggio o ancora non finito rimane 0
-        # Verifica se esiste un tris vincente a livello di mini board
-        vinto = False
-        for item in PosizioniVincenti:
-            if stato[item[0]] == stato[item[1]] == stato[item[2]] != 0:
-                self.fine = True
-                self.vincitore = VocGiocatori[stato[item[0]]]
-                self.tris = item  # Combinazione vincente (gli indici dei mini board)
-                vinto = True
-                break
-        # Se tutti i mini board sono conclusi e non c'è un vincitore, il Trissone è un pareggio
-        if (not vinto) and all(board.fine for board in self.pos):
-            self.fine = True
-            self.vincitore = VocGiocatori[3]
-
-    def add(self, cerchio: bool, posizione: int, posGrande: int):
-        """
-        Aggiunge una mossa nel Trissone.
-          - cerchio: True se gioca il cerchio, False se gioca "ics"
-          - posizione: posizione (0-8) all'interno del mini board
-          - posGrande: indice del mini board scelto (usato solo se self.next è None)
-        """
-        if posizione < 0 or posizione > 8:
-            raise IndexError("Posizione non valida, out of bound")
-        if self.fine:
-            raise IndexError("Trissone già finito")
-
-        # Determina in quale mini board effettuare la mossa:
-        if self.next is None:
-            self.next = posGrande
-
-        elif posGrande != self.next:
-            raise IndexError("Non è qui che devi giocare!!!")
-        
-        board_index = posGrande
-
-        if (self.pos[board_index].fine):
-            self.next=None
-            raise IndexError("Tris piccolo già finito")
-
-        mini_board = self.pos[board_index]
-        if mini_board.pos[posizione] != 0:
-            raise IndexError("Posizione non valida")
-        # Aggiunge la mossa al mini board scelto
-        mini_board.add(cerchio, posizione)
-        # Imposta la prossima mossa nel mini board corrispondente alla cella appena giocata
-        self.next = posizione
-        if self.pos[self.next].fine:
-            self.next=None
-
-        self.Check()
-
-def mainPiccolo(show, n):
+def mainPiccolo(show, n, seed=None, giocatori=("casuale", "casuale"), tempo=None):
+    rng = rnd.Random(seed)
+    giocatori = tuple(crea_giocatore(nome, rng, tempo) for nome in giocatori)
     if show:
+        # Grafica e barra di avanzamento servono solo per mostrare le partite
+        import matplotlib.pyplot as plt
+        import Utility as U
+        from Grafica import draw_board
         plt.ion()  # Modalità interattiva
         fig = plt.figure(figsize=(8,8))
     
@@ -255,18 +44,15 @@ def mainPiccolo(show, n):
         if show:
             draw_board(Partita, showtime = show)
         while not Partita.fine:
-            try:
-                cell = rnd.randint(0, 8)
-                Partita.add(move % 2 == 0, cell)
-                move += 1
-                if show:
-                    draw_board(Partita,showtime = show)
-            except IndexError:
-                continue
+            cell = giocatori[move % 2].choose_move(Partita, tempo)
+            Partita.add(move % 2 == 0, cell)
+            move += 1
+            if show:
+                draw_board(Partita,showtime = show)
         # Disegna lo stato finale, evidenziando il tris vincente (se presente) a livello di Trissone
         if show:
             draw_board(Partita, showtime = show)
-        U.BarraCaricamento(args.n, partita_num)
+            U.BarraCaricamento(n, partita_num)
         if Partita.vincitore == VocGiocatori[1]:
             yc += 1
         elif Partita.vincitore == VocGiocatori[2]:
@@ -281,45 +67,197 @@ def mainPiccolo(show, n):
 
 
 
-def main(show, n):
+def gioca_partita(rng, show=0, patte=False, giocatori=None, tempo=None):
+    """
+    Gioca una partita di Trissone e la restituisce conclusa. 'giocatori' è la coppia
+    (cerchio, ics) di giocatori di Giocatori; di default entrambi giocano a caso con 'rng'.
+    """
+    if giocatori is None:
+        giocatori = (GiocatoreCasuale(rng),) * 2
+    Partita = Trissone(patte)
+    move = 0
+    # Disegna lo stato iniziale (tutti i mini board vuoti)
     if show:
-        plt.ion()  # Modalità interattiva
-        fig = plt.figure(figsize=(8,8))
-    
-    x = range(n)
-    yc, pareggi, yi = 0, 0, 0
-
-    for partita_num in x:
-        Partita = Trissone()
-        move = 0
-        # Disegna lo stato iniziale (tutti i mini board vuoti)
+        from Grafica import draw_big_board
+        draw_big_board(Partita, showtime = show)
+    while not Partita.fine:
+        # Il giocatore di turno sceglie una mossa legale (mini board e cella)
+        posGrande, cell = giocatori[move % 2].choose_move(Partita, tempo)
+        Partita.add(move % 2 == 0, cell, posGrande)
+        move += 1
         if show:
             draw_big_board(Partita, showtime = show)
-        while not Partita.fine:
-            try:
+    # Disegna lo stato finale, evidenziando il tris vincente (se presente) a livello di Trissone
+    if show:
+        draw_big_board(Partita, Partita.tris, show)
+    return Partita
 
-                # Se non c'è una restrizione, scegliamo un mini board a caso
-                posGrande = rnd.randint(0, 8)
-                
-                cell = rnd.randint(0, 8)
-                Partita.add(move % 2 == 0, cell, posGrande)
-                move += 1
-                if show:
-                    draw_big_board(Partita, showtime = show)
-            except IndexError:
-                continue
-        # Disegna lo stato finale, evidenziando il tris vincente (se presente) a livello di Trissone
-        if show:
-            draw_big_board(Partita, Partita.tris, show)
-        U.BarraCaricamento(args.n, partita_num)
+def gioca_blocco(seed, blocco, n, show=0, registra=False, patte=False, statistiche=False,
+                 giocatori=("casuale", "casuale"), tempo=None):
+    """
+    Gioca 'n' partite del blocco 'blocco' e restituisce i conteggi (cerchio, ics, pareggi),
+    se 'registra' le partite codificate nel formato di Registro (altrimenti b"")
+    e, se 'statistiche', le Statistiche del blocco (altrimenti None).
+    Ogni blocco ha il proprio generatore, con seme derivato da (seed, blocco): il risultato
+    non dipende quindi da quale processo gioca il blocco.
+    'giocatori' sono i nomi (chiavi di GIOCATORI) dei giocatori (cerchio, ics), creati per il blocco
+    con lo stesso generatore; 'tempo' è il budget per mossa dei giocatori di ricerca.
+    """
+    rng = rnd.Random(f"{seed}:{blocco}")
+    giocatori = tuple(crea_giocatore(nome, rng, tempo) for nome in giocatori)
+    yc, yi, pareggi = 0, 0, 0
+    registrate = bytearray()
+    stat = None
+    if statistiche:
+        from Statistiche import Statistiche
+        stat = Statistiche()
+    for _ in range(n):
+        Partita = gioca_partita(rng, show, patte, giocatori, tempo)
+        if registra:
+            # Ogni mossa è registrata come posGrande * 9 + posizione
+            mosse = Partita.mosse_giocate()
+            registrate.append(len(mosse))
+            registrate.extend(mosse)
+            registrate.append(1 if Partita.vincitore == VocGiocatori[1] else 2 if Partita.vincitore == VocGiocatori[2] else 3)
+        if stat is not None:
+            stat.aggiungi_partita(Partita)
         if Partita.vincitore == VocGiocatori[1]:
             yc += 1
         elif Partita.vincitore == VocGiocatori[2]:
             yi += 1
         else:
             pareggi += 1
+    return yc, yi, pareggi, bytes(registrate), stat
+
+def salva_checkpoint(percorso, stato):
+    """Scrive 'stato' (dizionario JSON) in modo atomico: file temporaneo, fsync e os.replace."""
+    temporaneo = percorso + ".tmp"
+    with open(temporaneo, "w") as f:
+        json.dump(stato, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporaneo, percorso)
+
+def carica_checkpoint(percorso):
+    with open(percorso) as f:
+        return json.load(f)
+
+def main(show, n, workers=1, seed=None, registro=None, patte=False, statistiche=None, intervallo=0,
+         giocatori=("casuale", "casuale"), tempo=None, checkpoint=None, riprendi=False, ogni=60.0):
+    """
+    Simula 'n' partite di Trissone tra i 'giocatori' (cerchio, ics), di default casuali.
+    Se 'statistiche' è un percorso (o 'intervallo' > 0) raccoglie le Statistiche delle partite,
+    ne stampa un'istantanea ogni 'intervallo' partite (arrotondate al blocco) e salva il
+    riassunto finale nel file 'statistiche'.
+    Con 'checkpoint' lo stato della simulazione (conteggi, seme, primo blocco da giocare,
+    dimensione del registro, statistiche) viene salvato al più ogni 'ogni' secondi; con 'riprendi'
+    la simulazione riparte dall'ultimo checkpoint (se esiste) e dà lo stesso risultato
+    di un'esecuzione senza interruzioni, perché ogni blocco ha un generatore derivato dal seme.
+    """
+    # Parametri che devono coincidere per riprendere una simulazione
+    parametri = {"n": n, "patte": patte, "giocatori": list(giocatori), "tempo": tempo,
+                 "registro": registro, "statistiche": statistiche is not None or intervallo > 0}
+    ripresa = None
+    if checkpoint is not None and riprendi and os.path.exists(checkpoint):
+        ripresa = carica_checkpoint(checkpoint)
+        if ripresa["parametri"] != parametri or seed not in (None, ripresa["seed"]):
+            raise SystemExit(f"{checkpoint}: il checkpoint è di una simulazione con parametri diversi")
+        seed = ripresa["seed"]
+    if seed is None:
+        seed = rnd.randrange(2**32)
+    if show:
+        # Grafica e barra di avanzamento servono solo per mostrare le partite
+        import matplotlib.pyplot as plt
+        import Utility as U
+        plt.ion()  # Modalità interattiva
+        fig = plt.figure(figsize=(8,8))
 
-    print(f"\npareggi: {pareggi}\nics: {yi}\ncerchio: {yc}\ntot: {pareggi+yi+yc}")
+    # Le partite sono divise in blocchi di BLOCCO partite, sia in seriale che in parallelo
+    nblocchi = (n + BLOCCO - 1) // BLOCCO
+    quante = [min(BLOCCO, n - b * BLOCCO) for b in range(nblocchi)]
+    yc, pareggi, yi = 0, 0, 0
+    primo = 0
+    if ripresa is not None:
+        yc, yi, pareggi = ripresa["conteggi"]
+        primo = ripresa["blocco"]
+
+    registra = registro is not None
+    raccogli = parametri["statistiche"]
+    blocchi = range(primo, nblocchi)
+    if workers > 1 and not show:
+        pool = ProcessPoolExecutor(workers)
+        k = len(blocchi)
+        risultati = pool.map(gioca_blocco, [seed] * k, blocchi, quante[primo:],
+                             [0] * k, [registra] * k, [patte] * k, [raccogli] * k,
+                             [giocatori] * k, [tempo] * k)
+    else:
+        pool = None
+        risultati = (gioca_blocco(seed, b, quante[b], show, registra, patte, raccogli, giocatori, tempo)
+                     for b in blocchi)
+
+    # Le statistiche dei blocchi vengono unite nell'ordine dei blocchi
+    totali = None
+    if raccogli:
+        from Statistiche import Statistiche
+        totali = Statistiche() if ripresa is None else Statistiche.da_stato(ripresa["stato_statistiche"])
+
+    # Le partite vengono accodate al registro un blocco alla volta, nell'ordine dei blocchi;
+    # alla ripresa si scartano quelle scritte dopo l'ultimo checkpoint (verranno rigiocate)
+    scrittore = None
+    if registra:
+        from Registro import ScrittoreRegistro
+        if ripresa is not None:
+            os.truncate(registro, ripresa["offset"])
+        scrittore = ScrittoreRegistro(registro)
+
+    def salva(blocco):
+        offset = None
+        if scrittore is not None:
+            scrittore.flush(disco=True)
+            offset = scrittore.tell()
+        salva_checkpoint(checkpoint, {
+            "parametri": parametri,
+            "seed": seed,
+            "blocco": blocco,
+            "conteggi": [yc, yi, pareggi],
+            "offset": offset,
+            "stato_statistiche": totali.stato() if totali is not None else None,
+        })
+
+    # Il primo checkpoint fissa seme e dimensione iniziale del registro, così una ripresa
+    # dopo un'interruzione precedente al primo checkpoint periodico non accoda partite doppie
+    if checkpoint is not None and ripresa is None:
+        salva(0)
+
+    fatte = sum(quante[:primo])
+    ultimo = time.monotonic()
+    for blocco, (c, i, p, registrate, stat) in zip(blocchi, risultati):
+        if scrittore is not None:
+            scrittore.scrivi_codificate(registrate)
+        yc += c
+        yi += i
+        pareggi += p
+        fatte += c + i + p
+        if show:
+            U.BarraCaricamento(n, fatte - 1)
+        if totali is not None:
+            totali.unisci(stat)
+            if intervallo > 0 and fatte // intervallo > (fatte - c - i - p) // intervallo:
+                print(totali.istantanea(), flush=True)
+        if checkpoint is not None and time.monotonic() - ultimo >= ogni:
+            salva(blocco + 1)
+            ultimo = time.monotonic()
+    if checkpoint is not None:
+        salva(nblocchi)
+    if pool is not None:
+        pool.shutdown()
+    if scrittore is not None:
+        scrittore.close()
+
+    print(f"\npareggi: {pareggi}\nics: {yi}\ncerchio: {yc}\ntot: {pareggi+yi+yc}\nseed: {seed}")
+    if statistiche is not None:
+        print(totali.istantanea())
+        totali.salva(statistiche)
     if show:
         plt.ioff()
         plt.show()
@@ -331,10 +269,29 @@ if __name__ == "__main__":
     parser.add_argument('-n', type=int, default=100, help='Numero di partite per la statistica')
     parser.add_argument('-show', type=float, default=0, help='Mostra le grafiche della partita')
     parser.add_argument('-Piccolo', action='store_true', help='Mostra le grafiche della partita')
+    parser.add_argument('-workers', type=int, default=1, help='Numero di processi per la simulazione del Trissone')
+    parser.add_argument('-seed', type=int, default=None, help='Seme del generatore casuale (a parità di seme il risultato è lo stesso)')
+    parser.add_argument('-registro', default=None, help='File binario in cui accodare le mosse di ogni partita (vedi Registro.py)')
+    parser.add_argument('-patte', action='store_true', help='Chiude in pareggio le partite appena nessuno può più vincere (più veloce, stessi risultati)')
+    parser.add_argument('-statistiche', default=None, help='File JSON in cui salvare il riassunto delle statistiche (vedi Statistiche.py)')
+    parser.add_argument('-intervallo', type=int, default=0, help='Stampa le statistiche parziali ogni INTERVALLO partite')
+    parser.add_argument('-cerchio', choices=list(GIOCATORI), default='casuale', help='Giocatore del cerchio (vedi Giocatori.py)')
+    parser.add_argument('-ics', choices=list(GIOCATORI), default='casuale', help="Giocatore dell'ics (vedi Giocatori.py)")
+    parser.add_argument('-tempo', type=float, default=None, help='Secondi per mossa dei giocatori di ricerca')
+    parser.add_argument('-checkpoint', default=None, help='File JSON in cui salvare periodicamente lo stato della simulazione')
+    parser.add_argument('-resume', action='store_true', help="Riprende la simulazione dall'ultimo checkpoint (se esiste)")
+    parser.add_argument('-ogni', type=float, default=60, help='Secondi minimi tra due checkpoint')
+    parser.add_argument('-batch', type=int, default=0, help='Gioca le partite a lotti di BATCH con il motore vettoriale NumPy')
     args = parser.parse_args()
 
     if args.Piccolo:
-        mainPiccolo(args.show, args.n)
+        mainPiccolo(args.show, args.n, args.seed, (args.cerchio, args.ics), args.tempo)
+    elif args.batch:
+        from Vettoriale import simula
+        # Come in main, senza seme se ne estrae uno e lo si stampa, così la simulazione si può ripetere
+        seed = args.seed if args.seed is not None else rnd.randrange(2**32)
+        yc, yi, pareggi = simula(args.n, args.batch, seed)
+        print(f"\npareggi: {pareggi}\nics: {yi}\ncerchio: {yc}\ntot: {pareggi+yi+yc}\nseed: {seed}")
     else:
-        main(args.show, args.n)
-
+        main(args.show, args.n, args.workers, args.seed, args.registro, args.patte, args.statistiche, args.intervallo,
+             (args.cerchio, args.ics), args.tempo, args.checkpoint, args.resume, args.ogni)
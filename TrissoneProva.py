@@ -1,10 +1,14 @@
 import matplotlib.pyplot as plt
 import argparse
-from Trissone import Tris, Trissone, draw_board, draw_big_board, VocGiocatori
+from Gioco import Tris, Trissone, VocGiocatori
+from Grafica import draw_board, draw_big_board
+from Giocatori import GIOCATORI, Pensatore, crea_giocatore, gioca
 
 # Impostazione degli argomenti:
 parser = argparse.ArgumentParser(description='Gioco Interattivo: Tic Tac Toe / Trissone')
 parser.add_argument('--big', action='store_true', help='Usa il Trissone (Ultimate Tic Tac Toe)')
+parser.add_argument('--ai', choices=list(GIOCATORI), default=None, help="Giocatore del computer, che muove l'ics")
+parser.add_argument('--tempo', type=float, default=1.0, help='Secondi per mossa del computer')
 args = parser.parse_args()
 
 # Inizializza il gioco in base alla modalità scelta:
@@ -19,12 +23,38 @@ else:
 # True -> "cerchio" (O), False -> "ics" (X)
 current_player = True
 
+# Giocatore del computer (se richiesto): pensa in un thread, un timer ne controlla l'esito
+pensatore = Pensatore(crea_giocatore(args.ai, tempo=args.tempo), args.tempo) if args.ai else None
+
+def ridisegna():
+    """Ridisegna la partita (usata dopo le mosse del giocatore e del computer)."""
+    if interactive_big:
+        draw_big_board(game, game.tris, showtime=0)
+    else:
+        draw_board(game.pos, game.tris, showtime=0)
+
+def controlla_ai():
+    """Chiamata dal timer: gioca la mossa del computer appena è pronta."""
+    global current_player
+    mossa = pensatore.mossa()
+    if mossa is None:
+        return
+    gioca(game, mossa)
+    ridisegna()
+    if not game.fine:
+        current_player = not current_player
+    else:
+        print("Gioco terminato! Vincitore:", game.vincitore)
+
 def on_click(event):
     global game, current_player
     # Se il gioco è finito, non gestiamo ulteriori click
     if game.fine:
         print("Gioco terminato! Vincitore:", game.vincitore)
         return
+    # Durante il turno del computer i click vengono ignorati
+    if pensatore is not None and pensatore.attivo:
+        return
     # Se il click è fuori dall'area (xdata o ydata None) lo ignoriamo
     if event.xdata is None or event.ydata is None:
         return
@@ -42,9 +72,11 @@ def on_click(event):
         cell_index = row * 3 + col
         try:
             game.add(current_player, cell_index)
-            draw_board(game.pos, game.tris, showtime=0)
+            ridisegna()
             if not game.fine:
                 current_player = not current_player
+                if pensatore is not None:
+                    pensatore.avvia(game)
             else:
                 print("Gioco terminato! Vincitore:", game.vincitore)
         except Exception as e:
@@ -93,9 +125,11 @@ def on_click(event):
 
         try:
             game.add(current_player, cell_index, big_index)
-            draw_big_board(game, game.tris, showtime=0)
+            ridisegna()
             if not game.fine:
                 current_player = not current_player
+                if pensatore is not None:
+                    pensatore.avvia(game)
             else:
                 print("Gioco terminato! Vincitore:", game.vincitore)
         except Exception as e:
@@ -110,6 +144,10 @@ def main():
         draw_big_board(game, showtime=0)
         plt.title("Trissone Interattivo\n(Clicca sulla casella per fare la mossa)")
     fig.canvas.mpl_connect('button_press_event', on_click)
+    if pensatore is not None:
+        timer = fig.canvas.new_timer(interval=33)
+        timer.add_callback(controlla_ai)
+        timer.start()
     plt.show()
 
 if __name__ == "__main__":
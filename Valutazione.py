@@ -0,0 +1,126 @@
+'''
+Valutazione euristica delle posizioni di Trissone (e di tris), dal punto di vista del cerchio:
+un numero in [-1, 1], 1 e -1 per le partite vinte dal cerchio e dall'ics, 0 per i pareggi.
+
+Ogni mini board contribuisce con la "probabilità" che lo faccia proprio ciascun giocatore,
+stimata dalle linee ancora aperte pesate per i simboli già presenti (una linea con due
+simboli è una minaccia); vale 1 (o 0) se il mini board è già vinto (o perso o patto).
+Le probabilità dipendono solo dal codice del mini board, quindi sono tabelle di 19683 valori
+calcolate una volta all'import: una mossa cambia un solo mini board e una sola lettura.
+Su queste si valutano:
+  - il potenziale delle linee grandi: per ogni linea, prodotto delle probabilità dei suoi
+    mini board per il cerchio meno lo stesso prodotto per l'ics
+  - i singoli mini board, pesati per il numero di linee grandi che li attraversano
+  - il mini board obbligato (next) per il giocatore di turno: scelta libera o una minaccia
+    da completare valgono un vantaggio
+
+valuta lavora su una posizione (Tris, TrisBit, Trissone, TrissoneBit), valuta_batch su array
+NumPy di molte posizioni, nel formato di PartiteVettoriali (celle, next, turno).
+'''
+import math
+import numpy as np
+from Tabelle import Potenze3, PosizioniVincenti, EsitoTris, MinacceCerchio, MinacceIcs
+from Gioco import VocGiocatori
+from Giocatori import di_turno, grande, situazione
+
+
+# Peso di una linea aperta con 0, 1 o 2 simboli del giocatore (3 solo nei mini board conclusi)
+PesiLinea = (1.0, 3.0, 9.0, 0.0)
+# Peso complessivo delle linee del mini board vuoto: le probabilità iniziali sono 1/3 ciascuna
+Incertezza = 8.0
+# Pesi dei termini della valutazione (prima della tangente iperbolica)
+PesoLineeGrandi = 1.0
+PesoMiniBoard = 0.25
+ValoreLibero = 0.1     # Il giocatore di turno sceglie il mini board
+ValoreMinaccia = 0.15  # Il giocatore di turno può vincere subito il mini board obbligato
+# Linee grandi che attraversano ogni mini board (centro 4, angoli 3, lati 2), normalizzate
+PesiBoard = [sum(i in linea for linea in PosizioniVincenti) / 4 for i in range(9)]
+
+_Linee = np.array(PosizioniVincenti, dtype=np.intp)
+_Potenze = np.array(Potenze3, dtype=np.intp)
+_Esito = np.array(EsitoTris, dtype=np.int8)
+
+
+def _probabilita():
+    cifre = np.arange(19683)[:, None] // _Potenze % 3
+    linee = cifre[:, _Linee]
+    o = (linee == 1).sum(axis=2)
+    x = (linee == 2).sum(axis=2)
+    pesi = np.array(PesiLinea)
+    forza_o = np.where(x == 0, pesi[o], 0.0).sum(axis=1)
+    forza_x = np.where(o == 0, pesi[x], 0.0).sum(axis=1)
+    totale = forza_o + forza_x + Incertezza
+    cerchio = np.where(_Esito == 1, 1.0, np.where(_Esito == 0, forza_o / totale, 0.0))
+    ics = np.where(_Esito == 2, 1.0, np.where(_Esito == 0, forza_x / totale, 0.0))
+    return cerchio, ics
+
+
+# Probabilità stimata che il mini board di codice c vada al cerchio / all'ics
+ProbCerchio, ProbIcs = _probabilita()
+_MinacciaCerchio = np.array(MinacceCerchio) != 0
+_MinacciaIcs = np.array(MinacceIcs) != 0
+_PesiBoard = np.array(PesiBoard)
+# Le stesse tabelle come liste, più veloci da indicizzare una posizione alla volta
+_ProbCerchio = ProbCerchio.tolist()
+_ProbIcs = ProbIcs.tolist()
+
+
+def _finale(stato):
+    if stato.vincitore == VocGiocatori[1]:
+        return 1.0
+    if stato.vincitore == VocGiocatori[2]:
+        return -1.0
+    return 0.0
+
+
+def valuta(stato):
+    """Valutazione di una posizione per il cerchio, in [-1, 1] (vedi il docstring del modulo)."""
+    if stato.fine:
+        return _finale(stato)
+    if not grande(stato):
+        c = stato.codice
+        return _ProbCerchio[c] - _ProbIcs[c]
+    codici = situazione(stato)[0]
+    po = [_ProbCerchio[c] for c in codici]
+    px = [_ProbIcs[c] for c in codici]
+    linee = sum(po[a] * po[b] * po[c] - px[a] * px[b] * px[c] for a, b, c in PosizioniVincenti)
+    mini = sum(p * (o - x) for p, o, x in zip(PesiBoard, po, px))
+    cerchio = di_turno(stato)
+    if stato.next is None:
+        tempo = ValoreLibero
+    else:
+        minacce = MinacceCerchio if cerchio else MinacceIcs
+        tempo = ValoreMinaccia if minacce[codici[stato.next]] else 0.0
+    return math.tanh(PesoLineeGrandi * linee + PesoMiniBoard * mini + (tempo if cerchio else -tempo))
+
+
+def valuta_batch(celle, next, cerchio):
+    """
+    Valuta n posizioni di Trissone insieme:
+      - celle: array (n, 9, 9) o (n, 81) di valori 0 vuota, 1 O, 2 X
+      - next: array (n,) del mini board obbligato, -1 (o 9) se la scelta è libera
+      - cerchio: True se tocca al cerchio, per tutte le posizioni o come array (n,)
+    Restituisce un array (n,) con gli stessi valori di valuta (a meno dell'arrotondamento).
+    Con PartiteVettoriali: valuta_batch(p.celle, p.next, p.mosse % 2 == 0).
+    """
+    celle = np.asarray(celle).reshape(-1, 9, 9)
+    n = len(celle)
+    codici = celle.astype(np.intp) @ _Potenze
+    po = ProbCerchio[codici]
+    px = ProbIcs[codici]
+    linee = po[:, _Linee].prod(axis=2).sum(axis=1) - px[:, _Linee].prod(axis=2).sum(axis=1)
+    mini = (po - px) @ _PesiBoard
+    cerchio = np.broadcast_to(np.asarray(cerchio, dtype=bool), (n,))
+    next = np.asarray(next)
+    libero = (next < 0) | (next > 8)
+    obbligato = codici[np.arange(n), np.where(libero, 0, next)]
+    minaccia = np.where(cerchio, _MinacciaCerchio[obbligato], _MinacciaIcs[obbligato])
+    tempo = np.where(libero, ValoreLibero, np.where(minaccia, ValoreMinaccia, 0.0))
+    valori = np.tanh(PesoLineeGrandi * linee + PesoMiniBoard * mini + np.where(cerchio, tempo, -tempo))
+
+    # Partite concluse: tris grande di uno dei due giocatori, oppure tutti i mini board chiusi
+    esiti = _Esito[codici]
+    vinta_o = (esiti[:, _Linee] == 1).all(axis=2).any(axis=1)
+    vinta_x = (esiti[:, _Linee] == 2).all(axis=2).any(axis=1)
+    chiusa = (esiti != 0).all(axis=1)
+    return np.where(vinta_o, 1.0, np.where(vinta_x, -1.0, np.where(chiusa, 0.0, valori)))
@@ -0,0 +1,88 @@
+import numpy as np
+from Gioco import PosizioniVincenti
+
+
+# Combinazioni vincenti come array (8, 3) per l'indicizzazione vettoriale
+Linee = np.array(PosizioniVincenti, dtype=np.intp)
+
+
+class PartiteVettoriali:
+    '''
+    K partite di Trissone giocate contemporaneamente con operazioni NumPy.
+    Tutte le partite avanzano di una mossa per passo, quindi il giocatore di turno
+    è lo stesso per tutte (il cerchio muove quando il numero di mosse è pari).
+    '''
+    def __init__(self, k):
+        self.celle = np.zeros((k, 9, 9), dtype=np.int8)  # [partita, mini board, cella]: 0 vuota, 1 O, 2 X
+        self.stato = np.zeros((k, 9), dtype=np.int8)     # Mini board: 0 aperto, 1 O, 2 X, 3 pareggio
+        self.next = np.full(k, -1, dtype=np.int8)        # Mini board obbligato, -1 se la scelta è libera
+        self.vincitore = np.zeros(k, dtype=np.int8)      # 0 in corso, 1 cerchio, 2 ics, 3 pareggio
+        self.mosse = 0
+
+    @property
+    def fine(self):
+        return bool((self.vincitore != 0).all())
+
+    def legal_moves(self, indici=None):
+        """
+        Maschera booleana (n, 81) delle mosse legali per le partite 'indici'
+        (tutte se None); la mossa j corrisponde a mini board j // 9 e cella j % 9.
+        """
+        if indici is None:
+            indici = np.arange(len(self.vincitore))
+        libere = (self.celle[indici] == 0) & (self.stato[indici] == 0)[:, :, None]
+        nxt = self.next[indici, None]
+        permesse = (nxt == -1) | (nxt == np.arange(9))
+        legali = libere & permesse[:, :, None] & (self.vincitore[indici] == 0)[:, None, None]
+        return legali.reshape(len(indici), 81)
+
+    def step(self, rng):
+        """Fa avanzare di una mossa casuale (uniforme tra quelle legali) ogni partita in corso."""
+        indici = np.flatnonzero(self.vincitore == 0)
+        if len(indici) == 0:
+            return
+        giocatore = 1 if self.mosse % 2 == 0 else 2
+
+        # Estrazione uniforme: chiave casuale sulle mosse legali, -1 sulle altre, poi argmax
+        chiavi = rng.random((len(indici), 81))
+        chiavi[~self.legal_moves(indici)] = -1.0
+        scelta = chiavi.argmax(axis=1)
+        board = scelta // 9
+        cella = scelta % 9
+        self.celle[indici, board, cella] = giocatore
+
+        # Stato dei mini board appena giocati
+        mini = self.celle[indici, board]
+        vinto = (mini[:, Linee] == giocatore).all(axis=2).any(axis=1)
+        pieno = (mini != 0).all(axis=1)
+        self.stato[indici, board] = np.where(vinto, giocatore, np.where(pieno, 3, 0))
+
+        # Stato del Trissone (solo dove un mini board è stato appena vinto può esserci un tris grande)
+        stato = self.stato[indici]
+        vinto_grande = vinto & (stato[:, Linee] == giocatore).all(axis=2).any(axis=1)
+        tutti_chiusi = (stato != 0).all(axis=1)
+        self.vincitore[indici] = np.where(vinto_grande, giocatore, np.where(tutti_chiusi, 3, 0))
+
+        # La prossima mossa va giocata nel mini board corrispondente alla cella, se ancora aperto
+        self.next[indici] = np.where(stato[np.arange(len(indici)), cella] == 0, cella, -1)
+        self.mosse += 1
+
+    def gioca(self, rng):
+        """Gioca tutte le partite fino alla fine (al massimo 81 passi)."""
+        while not self.fine:
+            self.step(rng)
+
+
+def simula(n, k=4096, seed=None):
+    """
+    Gioca 'n' partite casuali a lotti di 'k' e restituisce i conteggi (cerchio, ics, pareggi).
+    """
+    rng = np.random.default_rng(seed)
+    conteggi = np.zeros(4, dtype=np.int64)
+    fatte = 0
+    while fatte < n:
+        lotto = PartiteVettoriali(min(k, n - fatte))
+        lotto.gioca(rng)
+        conteggi += np.bincount(lotto.vincitore, minlength=4)
+        fatte += len(lotto.vincitore)
+    return int(conteggi[1]), int(conteggi[2]), int(conteggi[3])
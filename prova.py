@@ -1,7 +1,7 @@
 import pygame
 import sys
 import numpy as np
-from Trissone import Tris, Trissone
+from Gioco import Tris, Trissone
 
 pygame.init()
 
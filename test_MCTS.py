@@ -0,0 +1,30 @@
+'''
+Prova di MCTS e GiocatoreRicerca: partite complete contro il giocatore casuale, con il
+riuso dell'albero tra una mossa e l'altra (anche quando la modalità patte chiude in anticipo
+la posizione della ricerca).
+
+    python -m unittest test_MCTS
+'''
+import random as rnd
+import unittest
+from Gioco import Trissone
+from Giocatori import GiocatoreCasuale, GiocatoreRicerca, gioca
+
+
+class ProvaMCTS(unittest.TestCase):
+
+    def test_partite_contro_casuale(self):
+        for seme in range(60):
+            rng = rnd.Random(seme)
+            giocatori = (GiocatoreRicerca(None, rng, iterazioni=30), GiocatoreCasuale(rng))
+            if seme % 2:
+                giocatori = giocatori[::-1]
+            partita = Trissone()
+            while not partita.fine:
+                mossa = giocatori[partita.mosse % 2].choose_move(partita)
+                self.assertIn(mossa, partita.legal_moves())
+                gioca(partita, mossa)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+'''
+Prova di Server.py con client locali: un server in-process su una porta libera e alcuni
+client asyncio.open_connection che giocano partite contemporanee.
+
+    python -m unittest test_Server
+'''
+import json
+import asyncio
+import unittest
+from Server import ServerTrissone
+
+
+class ProvaServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = ServerTrissone(scadenza=60)
+        self.tcp = await asyncio.start_server(self.server.connessione, "127.0.0.1", 0)
+        self.porta = self.tcp.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.tcp.close()
+        await self.tcp.wait_closed()
+
+    async def _client(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.porta)
+
+        async def chiedi(richiesta):
+            writer.write(json.dumps(richiesta).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+        return reader, writer, chiedi
+
+    async def _partita_tris(self, celle):
+        reader, writer, chiedi = await self._client()
+        try:
+            risposta = await chiedi({"cmd": "nuova", "tipo": "tris"})
+            self.assertTrue(risposta["ok"])
+            id = risposta["id"]
+            for cella in celle:
+                risposta = await chiedi({"cmd": "mossa", "id": id, "cella": cella})
+                self.assertTrue(risposta["ok"], risposta)
+            return id, risposta["stato"]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_partite_contemporanee(self):
+        # Il cerchio vince sulla prima riga, con l'ics che risponde sulla seconda
+        risultati = await asyncio.gather(*(self._partita_tris([0, 3, 1, 4, 2]) for _ in range(8)))
+        self.assertEqual(len({id for id, _ in risultati}), 8)
+        for _, stato in risultati:
+            self.assertTrue(stato["fine"])
+            self.assertEqual(stato["vincitore"], "cerchio")
+            self.assertEqual(stato["tris"], [0, 1, 2])
+        self.assertEqual(len(self.server.sessioni), 8)
+
+    async def test_trissone(self):
+        reader, writer, chiedi = await self._client()
+        id = (await chiedi({"cmd": "nuova"}))["id"]
+        risposta = await chiedi({"cmd": "mossa", "id": id, "board": 4, "cella": 0})
+        self.assertTrue(risposta["ok"])
+        self.assertEqual(risposta["stato"]["next"], 0)
+        self.assertEqual(risposta["stato"]["turno"], "ics")
+        mosse = (await chiedi({"cmd": "mosse", "id": id}))["mosse"]
+        self.assertEqual(sorted(mosse), [[0, k] for k in range(9)])
+        # Mossa fuori dal mini board obbligato: errore, stato invariato
+        self.assertFalse((await chiedi({"cmd": "mossa", "id": id, "board": 4, "cella": 1}))["ok"])
+        self.assertEqual((await chiedi({"cmd": "stato", "id": id}))["stato"]["turno"], "ics")
+        self.assertTrue((await chiedi({"cmd": "chiudi", "id": id}))["ok"])
+        self.assertFalse((await chiedi({"cmd": "stato", "id": id}))["ok"])
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_errori(self):
+        reader, writer, chiedi = await self._client()
+        id = (await chiedi({"cmd": "nuova"}))["id"]
+        risposta = await chiedi({"cmd": "mossa", "id": id, "cella": 0})
+        self.assertFalse(risposta["ok"])
+        self.assertIn("board", risposta["errore"])
+        self.assertFalse((await chiedi({"cmd": "boh"}))["ok"])
+        writer.write(b"non json\n")
+        self.assertFalse(json.loads(await reader.readline())["ok"])
+        # Una riga oltre il limite dello stream chiude la connessione con un errore
+        writer.write(b"x" * (1 << 17) + b"\n")
+        risposta = json.loads(await reader.readline())
+        self.assertEqual(risposta["errore"], "Richiesta troppo lunga")
+        self.assertEqual(await reader.readline(), b"")
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()